@@ -8,51 +8,195 @@ registering blueprints, and initializing the database.
 """
 import os
 import sys
+import hmac
+import atexit
+import queue
 import logging
-from pythonjsonlogger import jsonlogger # For structured JSON logging.
+import importlib.util
+from functools import lru_cache
+from typing import Final
+from logging.handlers import QueueHandler, QueueListener
+import orjson # Fast JSON serialization for structured log records.
 from flask import Flask
+from markupsafe import Markup # Marks the version string as safe for templates.
 from flask_wtf.csrf import CSRFProtect # For Cross-Site Request Forgery protection.
 from app.error import register_error_handlers # Custom error page handlers.
+from utils.url_helpers import cached_url_for # Memoized url_for for templates.
+from utils.template_cache import configure_template_cache, precompile_templates
+from app.config import Config, DEV_SECRET_KEY, MAX_UPLOAD_BYTES # Base settings and values shared with Config.
+from app.env import ENV # Environment variables, parsed once.
+from app.extensions import cache # Flask-Caching instance (memoized read helpers).
+from app.json_provider import OrjsonProvider # orjson for jsonify/get_json/sessions.
+
+# --- Application Version ---
+# Shown in the page footer (templates: `app_version`).
+# Consider making the version configurable (e.g., via env var or a file).
+APP_VERSION: Final[str] = "v1.0.0"
+
+# --- Project Paths ---
+# Resolved once at import instead of on every create_app() call.
+# _BASE_DIR is the project root (one level up from the 'app' directory).
+_BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_TEMPLATE_DIR = os.path.join(_BASE_DIR, "templates") # Path to HTML templates.
+_STATIC_DIR = os.path.join(_BASE_DIR, "static")      # Path to static files (CSS, JS, images).
+
+# --- Log Record Creation Cost ---
+# The JSON log format only uses the timestamp, level, logger name and message (plus `extra`),
+# so skip collecting the process/thread attributes it never emits. These are the documented,
+# process-wide `logging` switches, set once when this package is imported.
+logging.logProcesses = False
+logging.logThreads = False
+logging.logMultiprocessing = False
 
 
 # --- Custom JSON Logging Helper Classes ---
-class CustomJsonFormatter(jsonlogger.JsonFormatter):
+# Attributes every LogRecord has. Anything else in `record.__dict__` was passed through
+# `extra=` (e.g., the email notification logs) and is emitted as an additional JSON field.
+_RESERVED_RECORD_ATTRS = frozenset(logging.LogRecord('', 0, '', 0, '', None, None).__dict__) | {
+    'message', 'asctime', 'taskName',
+    '_cached_json', # Set by FastJsonFormatter.format() itself.
+}
+
+class FastJsonFormatter(logging.Formatter):
     """
-    Custom JSON log formatter to ensure consistent fields like 'timestamp',
-    'level', 'logger_name', and add application-specific default fields.
+    JSON log formatter producing one object per record with the fields 'timestamp',
+    'level', 'logger_name', 'message' and 'application', plus any `extra` fields and
+    'exc_info' when an exception is attached.
+
+    The fixed-shape dict is built directly from the known LogRecord attributes and
+    serialized with orjson; there is no per-attribute filtering loop in Python. Extra
+    fields are found with a single set difference against the standard attributes.
     """
-    def add_fields(self, log_record, record, message_dict):
-        super(CustomJsonFormatter, self).add_fields(log_record, record, message_dict)
-        # Ensure standard fields are present if not already added by the formatter.
-        if not log_record.get('timestamp'):
-            log_record['timestamp'] = record.created  # Unix timestamp (seconds since epoch).
-                                                      # Consider datetime.utcnow().isoformat() for ISO 8601.
-        if not log_record.get('level'):
-            log_record['level'] = record.levelname
-        if not log_record.get('logger_name'):
-            log_record['logger_name'] = record.name
-        
-        # Add application-specific static fields.
-        log_record['application'] = 'ticketslave' # Name of the application.
+    # Fields with the same value on every record. They are serialized once, when the
+    # formatter is created, and appended to each record's JSON as pre-built bytes.
+    STATIC_FIELDS = {
+        'application': 'ticketslave', # Name of the application.
         # Example: Add application version from environment variable.
-        # log_record['app_version'] = os.environ.get('APP_VERSION', 'unknown')
+        # 'app_version': os.environ.get('APP_VERSION', 'unknown'),
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # b'{"application":"ticketslave"}' -> b',"application":"ticketslave"}'
+        self._static_suffix = b',' + orjson.dumps(self.STATIC_FIELDS)[1:]
 
-class StdoutFilter(logging.Filter):
+    def format(self, record):
+        # The JSON text is cached on the record, so every handler sharing this formatter
+        # serializes a given record only once (the stdout/stderr level split normally routes
+        # a record to one handler, but any handler added later would reuse the result).
+        cached = record.__dict__.get('_cached_json')
+        if cached is not None:
+            return cached
+        log_record = {
+            'timestamp': record.created,  # Unix timestamp (seconds since epoch).
+            'level': record.levelname,
+            'logger_name': record.name,
+            'message': record.getMessage(),
+        }
+        extra_keys = record.__dict__.keys() - _RESERVED_RECORD_ATTRS
+        if extra_keys:
+            for key in extra_keys:
+                log_record[key] = record.__dict__[key]
+        if record.exc_info:
+            log_record['exc_info'] = self.formatException(record.exc_info)
+        # `default=str` keeps non-JSON values passed via `extra=` from breaking the log line.
+        record._cached_json = (orjson.dumps(log_record, default=str)[:-1] + self._static_suffix).decode()
+        return record._cached_json
+
+class InProcessQueueHandler(QueueHandler):
     """
-    A logging filter that allows records with level INFO or lower (DEBUG, INFO)
-    to pass through. Intended for directing these logs to STDOUT.
+    QueueHandler feeding a QueueListener thread in the same process.
+
+    The stock `QueueHandler.prepare()` formats the record in the calling thread (to make it
+    picklable for multiprocessing queues) and strips `exc_info`. With an in-process listener
+    neither is needed: only the message arguments are merged here, so later mutation of
+    those arguments cannot change the logged text, and the JSON formatting plus the
+    stream write happen on the listener thread.
     """
-    def filter(self, record):
-        return record.levelno <= logging.INFO
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
-class StderrFilter(logging.Filter):
+class StdoutHandler(logging.StreamHandler):
     """
-    A logging filter that allows records with level WARNING or higher
-    (WARNING, ERROR, CRITICAL) to pass through. Intended for directing
-    these logs to STDERR.
+    A stream handler that only emits records with level INFO or lower (DEBUG, INFO).
+    Intended for directing these logs to STDOUT; WARNING and above go to the
+    STDERR handler, whose own `setLevel(logging.WARNING)` does the selection there.
+
+    The upper bound is checked in `emit()` rather than with a logging.Filter, so no
+    filter chain is run for every record.
+    """
+    def emit(self, record):
+        if record.levelno <= logging.INFO:
+            super().emit(record)
+
+
+@lru_cache(maxsize=None)
+def _load_api_module():
     """
-    def filter(self, record):
-        return record.levelno >= logging.WARNING
+    Registers the optional REST API module (app/api.py) as a lazily loaded module.
+
+    The API pulls in Flask-JWT-Extended and its own routes. Only when the 'enable_api'
+    setting is on is the module registered in `sys.modules`, and through
+    `importlib.util.LazyLoader` its code runs on first attribute access rather than here, so a
+    worker that never touches the API never pays for the import. Cached so this happens at
+    most once per process however many apps are created. A plain `import app.api` inside
+    create_app would also rebind the local name `app` to this package.
+    """
+    module = sys.modules.get('app.api')
+    if module is not None: # Already imported (e.g., directly by other code).
+        return module
+    spec = importlib.util.find_spec('app.api')
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['app.api'] = module
+    loader.exec_module(module) # Defers the real execution until first attribute access.
+    return module
+
+
+def _check_secret_key(app):
+    """
+    Sets `app.secret_key` from the SECRET_KEY environment variable, once, at app creation.
+
+    In production a missing SECRET_KEY is fatal. Elsewhere the development fallback
+    (`app.config.DEV_SECRET_KEY`, shared with Config) is used with a warning. Whether the
+    fallback is in use is stored as `app._secret_key_is_default`, so later code can check the
+    flag instead of comparing key strings again.
+    """
+    if ENV.is_prod and not ENV.secret_key:
+        app.logger.critical("FATAL: SECRET_KEY environment variable must be set in production. Application cannot start.")
+        raise RuntimeError("SECRET_KEY must be set in production for security reasons.")
+    # Use SECRET_KEY from environment or a default (INSECURE) key for development.
+    app.secret_key = ENV.secret_key if ENV.secret_key is not None else DEV_SECRET_KEY
+    app._secret_key_is_default = hmac.compare_digest(app.secret_key.encode(), DEV_SECRET_KEY.encode())
+    if app._secret_key_is_default:
+        app.logger.warning(
+            "SECURITY WARNING: Running with a default development secret key. "
+            "This is INSECURE and NOT suitable for production. "
+            "Set the SECRET_KEY environment variable to a strong, unique random value."
+        )
+
+
+def _install_profiler(app):
+    """
+    Wraps the WSGI app in Werkzeug's ProfilerMiddleware (cProfile per request).
+
+    Enabled with FLASK_PROFILE=1. Each request's profile is written as a `.prof` file to
+    FLASK_PROFILE_DIR (default: `<instance path>/profiles`), which can be opened with
+    snakeviz, or converted to a flamegraph (e.g., with flameprof). Nothing is printed
+    to the log stream. Profiling adds noticeable overhead; enable it temporarily, on one
+    instance, to find slow endpoints.
+    """
+    # Imported here so a normal start never loads the profiler (or cProfile).
+    from werkzeug.middleware.profiler import ProfilerMiddleware
+
+    profile_dir = ENV.profile_dir or os.path.join(app.instance_path, "profiles")
+    if not os.path.isdir(profile_dir):
+        os.makedirs(profile_dir, exist_ok=True)
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app, stream=None, profile_dir=profile_dir)
+    app.logger.warning("Request profiling is ENABLED (FLASK_PROFILE=1); profiles are written to %s.", profile_dir)
 
 
 def create_app():
@@ -60,66 +204,87 @@ def create_app():
     Application factory function. Creates, configures, and returns the Flask app instance.
     """
     # --- Determine Base and Data Directories ---
-    # base_dir is the project root (one level up from 'app' directory).
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    # The project root and template/static paths are module constants (_BASE_DIR etc.).
     # data_dir is where persistent data like uploads and instance folder (DB) will be stored.
     # It defaults to a 'data' subdirectory in the project root but can be overridden by DATA_DIR env var.
-    data_dir = os.environ.get("DATA_DIR", os.path.join(base_dir, "data"))
+    data_dir = ENV.data_dir if ENV.data_dir is not None else os.path.join(_BASE_DIR, "data")
+    # Each derived path is built once and reused below.
+    uploads_path = os.path.join(data_dir, "uploads")
+    instance_path = os.path.join(data_dir, "instance")
 
     # --- Ensure Essential Directories Exist ---
     # Create 'uploads' and 'instance' directories within data_dir if they don't exist.
     # These are crucial for file uploads and the SQLite database instance path.
-    os.makedirs(os.path.join(data_dir, "uploads"), exist_ok=True)
-    os.makedirs(os.path.join(data_dir, "instance"), exist_ok=True)
+    # The isdir() check skips makedirs (and its extra stat/mkdir attempts) on every normal start.
+    for required_dir in (uploads_path, instance_path):
+        if not os.path.isdir(required_dir):
+            os.makedirs(required_dir, exist_ok=True)
 
     # --- Initialize Flask Application ---
     app = Flask(
         __name__, # Name of the application module.
-        template_folder=os.path.join(base_dir, "templates"), # Path to HTML templates.
-        static_folder=os.path.join(base_dir, "static"),     # Path to static files (CSS, JS, images).
-        instance_path=os.path.join(data_dir, "instance")    # Path for instance-specific files (e.g., SQLite DB).
+        template_folder=_TEMPLATE_DIR,                      # Path to HTML templates.
+        static_folder=_STATIC_DIR,                          # Path to static files (CSS, JS, images).
+        instance_path=instance_path                         # Path for instance-specific files (e.g., SQLite DB).
                                                             # This is where Flask looks for config files by default
                                                             # and where the SQLite DB is placed.
     )
+    # Base settings from app.config.Config (session cookie flags, JWT expiry, upload limits, ...).
+    # Values that depend on DATA_DIR or are validated at startup (UPLOAD_FOLDER, DATABASE and
+    # the secret key) are overridden further down.
+    app.config.from_object(Config)
+
+    # Unbounded template cache plus an on-disk bytecode cache shared by the workers.
+    # Must run before anything touches app.jinja_env.
+    configure_template_cache(app)
+
+    # Use orjson for all of Flask's JSON handling (responses, request bodies, session cookie).
+    app.json = OrjsonProvider(app)
 
     # --- Configure Structured JSON Logging ---
     # Remove default Flask and Werkzeug handlers to replace them with custom JSON logging.
     # This provides more control over log output, especially for containerized environments.
-    for handler in list(app.logger.handlers): # Iterate over a copy of the list.
-        app.logger.removeHandler(handler)
-    
+    # Clearing the lists in place replaces one removeHandler() (and logging lock round trip) per handler.
+    app.logger.handlers.clear()
+
     werkzeug_logger = logging.getLogger('werkzeug') # Get Werkzeug's logger (handles HTTP request logs).
-    for handler in list(werkzeug_logger.handlers):
-        werkzeug_logger.removeHandler(handler)
+    werkzeug_logger.handlers.clear()
 
     # Create and configure the custom JSON formatter.
-    json_formatter = CustomJsonFormatter(
-        '%(asctime)s %(levelname)s %(name)s %(module)s %(funcName)s %(lineno)d %(message)s'
-        # The format string here is somewhat redundant with JsonFormatter but can provide defaults.
-    )
+    json_formatter = FastJsonFormatter()
 
     # Handler for STDOUT: Logs DEBUG and INFO messages.
-    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler = StdoutHandler(sys.stdout) # Caps output at INFO; see StdoutHandler.
     stdout_handler.setFormatter(json_formatter)
-    stdout_handler.addFilter(StdoutFilter()) # Apply filter to select appropriate log levels.
-    stdout_handler.setLevel(logging.DEBUG)   # Handler processes all messages from DEBUG up; filter does the selection.
+    stdout_handler.setLevel(logging.DEBUG)   # Handler processes all messages from DEBUG up to INFO.
 
     # Handler for STDERR: Logs WARNING, ERROR, and CRITICAL messages.
     stderr_handler = logging.StreamHandler(sys.stderr)
     stderr_handler.setFormatter(json_formatter)
-    stderr_handler.addFilter(StderrFilter())   # Apply filter.
     stderr_handler.setLevel(logging.WARNING) # Handler processes from WARNING up.
 
-    # Add custom handlers to Flask's application logger.
-    app.logger.addHandler(stdout_handler)
-    app.logger.addHandler(stderr_handler)
+    # Request threads only enqueue records; a background QueueListener thread formats them
+    # and performs the (blocking) writes to stdout/stderr. `respect_handler_level` keeps the
+    # per-handler level split above.
+    log_queue = queue.SimpleQueue()
+    queue_handler = InProcessQueueHandler(log_queue)
+    log_listener = QueueListener(log_queue, stdout_handler, stderr_handler, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop) # Flush queued records on interpreter shutdown.
+    app.extensions['log_listener'] = log_listener # Kept so it can be stopped explicitly (e.g., in tests).
+
+    # Add the queue handler to Flask's application logger.
+    app.logger.addHandler(queue_handler)
     # Set the overall level for the app logger. If app.debug is True, log DEBUG messages, otherwise INFO.
     app.logger.setLevel(logging.DEBUG if app.debug else logging.INFO)
+    app.logger.propagate = False # Records are fully handled here; don't also walk up to the root logger.
 
     # Configure Werkzeug logger to use the same JSON handlers and appropriate level.
-    werkzeug_logger.addHandler(stdout_handler)
-    werkzeug_logger.addHandler(stderr_handler)
-    werkzeug_logger.setLevel(logging.DEBUG if app.debug else logging.INFO)
+    # Werkzeug writes its per-request access lines at INFO. In production the app runs behind
+    # gunicorn (which has its own access log), so WARNING drops one JSON log line per request
+    # while still surfacing Werkzeug's warnings and errors.
+    werkzeug_logger.addHandler(queue_handler)
+    werkzeug_logger.setLevel(logging.DEBUG if app.debug else logging.WARNING)
     werkzeug_logger.propagate = False # Prevent Werkzeug logs from also going to the root logger, avoiding duplicates.
 
     app.logger.info("Application logging configured for JSON output to stdout/stderr.")
@@ -128,74 +293,72 @@ def create_app():
 
     # --- Application Configuration ---
     # Define paths for uploads and the database file.
-    app.config["UPLOAD_FOLDER"] = os.path.join(data_dir, "uploads") # Consistent with directory creation.
+    app.config["UPLOAD_FOLDER"] = uploads_path # Consistent with directory creation.
     app.config["DATABASE"] = os.path.join(app.instance_path, "database.db") # SQLite DB in instance folder.
 
-    # Log if the database file doesn't exist yet (it will be created by init_db).
-    if not os.path.exists(app.config["DATABASE"]):
-        app.logger.info(f"Database file not found at {app.config['DATABASE']}. It will be created upon initialization.")
-
-    # Register custom error handlers (e.g., for 404, 500 errors).
-    register_error_handlers(app)
+    # No existence check for the database file here: init_db() logs when it creates the schema
+    # in a new database, which saves a stat() on every process start.
 
     # Secret Key Configuration: Crucial for session security and CSRF protection.
-    IS_PROD = os.environ.get("FLASK_ENV") == "production"
-    if IS_PROD and not os.environ.get("SECRET_KEY"):
-        app.logger.critical("FATAL: SECRET_KEY environment variable must be set in production. Application cannot start.")
-        raise RuntimeError("SECRET_KEY must be set in production for security reasons.")
-    # Use SECRET_KEY from environment or a default (INSECURE) key for development.
-    app.secret_key = os.environ.get("SECRET_KEY", "default-dev-secret-key-please-change-me")
-    if app.secret_key == "default-dev-secret-key-please-change-me":
-        app.logger.warning(
-            "SECURITY WARNING: Running with a default development secret key. "
-            "This is INSECURE and NOT suitable for production. "
-            "Set the SECRET_KEY environment variable to a strong, unique random value."
-        )
+    _check_secret_key(app)
 
     # Flask-WTF CSRF Protection Configuration.
     app.config['WTF_CSRF_ENABLED'] = True  # Enable CSRF protection (default is True).
-    app.config['WTF_CSRF_SECRET_KEY'] = app.secret_key # Use the app's secret key for CSRF token generation.
+    # Use the app's secret key for CSRF token generation. It is stored as bytes so itsdangerous
+    # can feed it straight to the OpenSSL-backed HMAC instead of encoding a str on every token
+    # sign/verify. (Flask-WTF already compares tokens with hmac.compare_digest.)
+    app.config['WTF_CSRF_SECRET_KEY'] = (
+        app.secret_key.encode() if isinstance(app.secret_key, str) else app.secret_key
+    )
     app.config['WTF_CSRF_TIME_LIMIT'] = 3600  # CSRF token validity period in seconds (1 hour default).
     # app.config['WTF_CSRF_CHECK_DEFAULT'] = True # Ensures CSRF check is on by default for relevant form methods.
 
+    # In-process cache for memoized read helpers. SimpleCache is per worker process, so
+    # entries use short timeouts to bound staleness across gunicorn workers.
+    cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 30})
+
     # Initialize CSRF protection extension.
     csrf = CSRFProtect(app)
     app.logger.info("CSRF protection initialized for the application.")
 
-    # File Upload Configuration.
-    # Note: UPLOAD_FOLDER was already set using data_dir. This re-confirms or could be a slight redundancy.
-    # Ensure consistency if this path differs from the one used for os.makedirs.
-    # The path `os.path.join(base_dir, "uploads")` might differ from `os.path.join(data_dir, "uploads")`
-    # if DATA_DIR is set. Prefer `data_dir` for consistency.
-    # Corrected path:
-    app.config["UPLOAD_FOLDER"] = os.path.join(data_dir, "uploads")
-    app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024 # 10MB limit for file uploads.
+    # File Upload Configuration (UPLOAD_FOLDER is set above, next to DATABASE).
+    app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES # 10MB limit for file uploads.
 
     # --- Register Blueprints ---
-    # Blueprints are imported from routes/__init__.py where they are aggregated.
-    from routes import blueprints # Expects a list named 'blueprints' in routes/__init__.py
-    for bp in blueprints:
-        app.register_blueprint(bp)
-    app.logger.info(f"Registered {len(blueprints)} blueprints.")
-
-    # --- Template Context Processor ---
-    # Injects variables into the context of all templates.
-    @app.context_processor
-    def inject_version():
-        """Injects the application version into template contexts."""
-        # Consider making APP_VERSION configurable (e.g., via env var or a file).
-        return dict(app_version="v1.0.0") # Example version.
+    # The route modules are listed in routes/__init__.py and imported only here.
+    from routes import register_blueprints
+    app.logger.info("Registered %d blueprints.", register_blueprints(app))
+
+    # Register custom error handlers (e.g., for 404, 500 errors), after the blueprints.
+    register_error_handlers(app)
+
+    # --- Template Globals ---
+    # Constants available in all templates. Set once on the Jinja environment, so no context
+    # processor has to run (and build a dict) on every render.
+    # Markup: the version is a trusted constant, so `{{ app_version }}` is output without
+    # running the autoescape function on every render.
+    app.jinja_env.globals['app_version'] = Markup(APP_VERSION)
+    # Templates build their links through a memoized url_for (see utils/url_helpers.py).
+    app.jinja_env.globals['url_for'] = cached_url_for
+
+    # Compile all templates now rather than on each page's first request in this worker.
+    compiled = precompile_templates(app)
+    app.logger.info("Precompiled %d templates.", compiled)
+
+    # --- Optional Request Profiling ---
+    # Off unless FLASK_PROFILE=1, in which case nothing is imported or wrapped.
+    if ENV.profile:
+        _install_profiler(app)
 
     # --- Database and Default Data Initialization ---
     # These operations require an active application context.
     with app.app_context():
-        from app.db import init_db, load_settings, ensure_default_settings, ensure_admin_user, ensure_default_queue
-        
+        from app.db import init_db, bootstrap_db
+
         app.logger.info("Initializing database schema and default data within application context...")
         init_db() # Create database tables if they don't exist.
-        ensure_default_settings() # Populate essential settings if missing.
-        
-        default_queue_id = ensure_default_queue() # Ensure a default queue exists and get its ID.
+        # Default settings, default queue and admin user, plus the settings read, on one connection.
+        settings, default_queue_id = bootstrap_db()
         if default_queue_id is None:
             app.logger.critical(
                 "Could not ensure or create the default ticket queue. "
@@ -204,19 +367,16 @@ def create_app():
             )
             # Depending on requirements, might raise an error or halt here.
         app.config['DEFAULT_QUEUE_ID'] = default_queue_id # Store default queue ID in app config for later use.
-        app.logger.info(f"Default queue ID set in app.config: {default_queue_id}")
-
-        settings = load_settings() # Load all application settings from the database.
-        ensure_admin_user()       # Ensure a default admin user exists.
+        app.logger.info("Default queue ID set in app.config: %s", default_queue_id)
 
         # Conditionally load API module based on settings.
         if settings.get("enable_api") == "1":
-            import app.api # Import the API module (app/api.py).
+            _load_api_module() # Register the API module (app/api.py) lazily, once per process.
             # If app.api has an init_app function or registers its own blueprint:
-            # e.g., if hasattr(app.api, 'init_api'): app.api.init_api(app)
+            # e.g., api_module = _load_api_module(); api_module.init_jwt(app)
             app.logger.info("API is enabled in settings and API module has been loaded.")
         else:
             app.logger.info("API is disabled in settings.")
 
-    app.logger.info(f"Flask application '{app.name}' created and configured successfully. Debug mode: {app.debug}")
+    app.logger.info("Flask application '%s' created and configured successfully. Debug mode: %s", app.name, app.debug)
     return app
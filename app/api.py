@@ -6,14 +6,21 @@ access to application functionalities, primarily ticket management.
 It uses JWT (JSON Web Tokens) for authentication on most endpoints and
 includes a webhook for external ticket creation.
 """
-import os
-from flask import Blueprint, request, jsonify, current_app
+import hmac
+import logging
+import orjson # Fast JSON encoding for large API responses.
+from flask import Blueprint, Response, g, request, jsonify, current_app
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from app.db import db_manager # Using the refactored db_manager
+from app.env import ENV # Environment variables, parsed once.
+from app.database_manager import get_database_connection
+from app.extensions import cache
 from app.notifications_core import notify_assigned_user
-from utils.context_runner import run_in_app_context
-from werkzeug.security import check_password_hash # For secure password checking.
+from utils.context_runner import enqueue_in_app_context # Batched background notifications.
+from utils.render_cache import mark_tickets_changed
+from utils.passwords import verify_password # Secure password checking (cached on success).
 
 # Define the Blueprint for API routes.
 # All routes defined with 'api' will be prefixed (e.g., /api/token).
@@ -32,21 +39,119 @@ def init_jwt(app):
     """
     # JWT_SECRET_KEY: A strong, random secret key used to sign JWTs.
     # CRITICAL: This MUST be kept secret and should be set via environment variable in production.
-    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'default-super-secret-jwt-key-change-me!')
+    app.config['JWT_SECRET_KEY'] = ENV.jwt_secret_key if ENV.jwt_secret_key is not None else 'default-super-secret-jwt-key-change-me!'
     if app.config['JWT_SECRET_KEY'] == 'default-super-secret-jwt-key-change-me!':
         current_app.logger.warning(
             "SECURITY WARNING: Using a default JWT_SECRET_KEY. This is INSECURE. "
             "Set a strong, unique JWT_SECRET_KEY environment variable for production."
         )
     # JWT_ACCESS_TOKEN_EXPIRES: How long an access token is valid.
-    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=int(os.getenv('JWT_EXPIRATION_HOURS', '1'))) # Default 1 hour
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=ENV.jwt_expiration_hours) # Default 1 hour
     jwt.init_app(app) # Register JWTManager with the Flask app.
     current_app.logger.info("JWTManager initialized for API authentication.")
 
+# --- Webhook Secret ---
+def init_webhook(app):
+    """
+    Reads the webhook secret (WEBHOOK_SECRET environment variable) once and stores it
+    UTF-8 encoded in `app.config['WEBHOOK_SECRET_BYTES']` (empty bytes if unset), ready
+    for constant-time comparison in `webhook_create_ticket`.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    app.config['WEBHOOK_SECRET_BYTES'] = ENV.webhook_secret.encode('utf-8')
+
+def _webhook_secret_bytes():
+    """Returns the encoded webhook secret, initializing it on first use if init_webhook() was not called."""
+    secret = current_app.config.get('WEBHOOK_SECRET_BYTES')
+    if secret is None:
+        init_webhook(current_app)
+        secret = current_app.config['WEBHOOK_SECRET_BYTES']
+    return secret
+
+# --- Authenticated Identity ---
+def _current_user_id():
+    """
+    Returns the user ID from the request's JWT, looked up once per request and kept
+    on `flask.g`. Views and helpers use this instead of calling get_jwt_identity() directly,
+    so the identity source can be changed in one place.
+    """
+    user_id = g.get('api_user_id')
+    if user_id is None:
+        user_id = g.api_user_id = get_jwt_identity()
+    return user_id
+
+# --- Query Parameter Parsing ---
+# Query-string values accepted as "true" for boolean flags.
+_TRUE_VALUES = frozenset(('true', '1', 'yes', 'on'))
+# Upper bound for `per_page`, which bounds the cost of a single list request.
+MAX_PER_PAGE = 100
+
 # --- Helper Function for Pagination ---
+# The ticket list has a fixed set of filter combinations, so every query variant is built once
+# here instead of concatenating WHERE clauses per request; constant SQL text also keeps
+# sqlite3's per-connection statement cache hitting. Status values are stored lowercase (CHECK
+# constraint), so no LOWER() is needed, and the literal `status != 'closed'` lets SQLite use the
+# partial index idx_tickets_assignee_open_created.
+_OPEN_ONLY_SQL = "tickets.status != 'closed'"
+
+# Total over all tickets, or all non-closed ones (parameter: 1 to include closed tickets).
+_STATS_COUNT_SQL = "SELECT COALESCE(SUM(cnt), 0) AS total_count FROM ticket_stats WHERE (? OR status != 'closed')"
+
+# Tickets assigned to one user, keyed by show_closed (parameter: user ID).
+_ASSIGNEE_COUNT_SQL = {
+    True: "SELECT COUNT(tickets.id) AS total_count FROM tickets WHERE tickets.assigned_to = ?",
+    False: f"SELECT COUNT(tickets.id) AS total_count FROM tickets WHERE {_OPEN_ONLY_SQL} AND tickets.assigned_to = ?",
+}
+
+def _page_ids_sql(show_closed, by_assignee, keyset):
+    """Builds one variant of the page-ID query (see _PAGE_IDS_SQL)."""
+    conditions = []
+    if not show_closed:
+        conditions.append(_OPEN_ONLY_SQL)
+    if by_assignee:
+        conditions.append("tickets.assigned_to = ?")
+    if keyset:
+        # Row-value comparison: everything strictly after the cursor ticket in list order.
+        conditions.append("(tickets.created_at, tickets.id) < (?, ?)")
+    query = "SELECT tickets.id FROM tickets"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # `id` breaks ties between tickets created in the same second so pages (and the keyset
+    # cursor) are stable.
+    query += " ORDER BY tickets.created_at DESC, tickets.id DESC LIMIT ?"
+    if not keyset:
+        query += " OFFSET ?"
+    return query
+
+# IDs of one page of tickets, keyed by (show_closed, filtered by assignee, keyset cursor).
+_PAGE_IDS_SQL = {
+    (show_closed, by_assignee, keyset): _page_ids_sql(show_closed, by_assignee, keyset)
+    for show_closed in (True, False) for by_assignee in (True, False) for keyset in (True, False)
+}
+
+# Full rows for the page IDs (parameter: JSON array of ticket IDs).
+_PAGE_TICKETS_SQL = """
+    SELECT tickets.*, creator.username AS created_by_username, assignee.username AS assigned_to_username, queues.name AS queue_name
+    FROM tickets
+    LEFT JOIN users AS creator ON tickets.created_by = creator.id
+    LEFT JOIN users AS assignee ON tickets.assigned_to = assignee.id
+    LEFT JOIN queues ON tickets.queue_id = queues.id
+    WHERE tickets.id IN (SELECT value FROM json_each(?))
+    ORDER BY tickets.created_at DESC, tickets.id DESC
+"""
+
+# Seconds a memoized ticket count may be served. API writes invalidate it immediately;
+# writes made through the web UI or another worker process show up after at most this long.
+TICKET_COUNT_CACHE_SECONDS = 30
+
+@cache.memoize(timeout=TICKET_COUNT_CACHE_SECONDS)
 def get_total_tickets_count(show_closed=False, assigned_to_user_id=None):
     """
     Helper function to get the total count of tickets based on filters.
+    Memoized per (show_closed, assigned_to_user_id), so paging through a list does
+    not re-run COUNT(*) for every page.
 
     Args:
         show_closed (bool): If True, includes closed tickets in the count.
@@ -55,27 +160,76 @@ def get_total_tickets_count(show_closed=False, assigned_to_user_id=None):
     Returns:
         int: The total number of tickets matching the criteria.
     """
-    query = "SELECT COUNT(tickets.id) AS total_count FROM tickets"
-    conditions = []
-    params = []
+    if assigned_to_user_id is None:
+        # Without an assignee filter the answer comes from the trigger-maintained per-status
+        # counts in ticket_stats (a handful of rows) instead of a COUNT over tickets. Unlike
+        # MAX(rowid)/sqlite_sequence this stays exact when tickets are deleted.
+        result = db_manager.fetchone(_STATS_COUNT_SQL, (1 if show_closed else 0,))
+        return result['total_count'] if result else 0
+
+    result = db_manager.fetchone(_ASSIGNEE_COUNT_SQL[show_closed], (assigned_to_user_id,))
+    return result['total_count'] if result else 0
 
-    if not show_closed:
-        conditions.append("LOWER(tickets.status) != ?")
-        params.append('closed')
-    
-    if assigned_to_user_id is not None:
-        conditions.append("tickets.assigned_to = ?")
-        params.append(assigned_to_user_id)
+def _deadline_to_epoch(value):
+    """
+    Normalizes a deadline supplied in a JSON payload to Unix epoch seconds, the storage format.
 
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-    
-    # Using db_manager for database interaction
-    result = db_manager.fetchone(query, tuple(params))
-    return result['total_count'] if result else 0
+    Accepts an integer epoch value, an ISO-8601 string ("YYYY-MM-DDTHH:MM:SS", naive values are
+    interpreted as server local time) or None (no deadline).
+
+    Raises:
+        ValueError: If the value cannot be interpreted as a timestamp.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    return int(datetime.fromisoformat(str(value)).timestamp())
 
 # --- API Endpoints ---
 
+# Version of a ticket for conditional GETs. updated_at is only NULL on tickets migrated from a
+# database without the column (and not changed since), so those fall back to created_at.
+TICKET_VERSION_SQL = "SELECT COALESCE(updated_at, created_at) AS version FROM tickets WHERE id = ?"
+
+# Ticket detail document: the ticket's columns, the related user/queue names and the
+# comments (oldest first, via the ordered subquery) as one JSON object.
+TICKET_DETAIL_JSON_SQL = """
+    SELECT json_object(
+        'id', tickets.id,
+        'title', tickets.title,
+        'description', tickets.description,
+        'status', tickets.status,
+        'priority', tickets.priority,
+        'deadline', tickets.deadline,
+        'created_at', tickets.created_at,
+        'created_by', tickets.created_by,
+        'queue_id', tickets.queue_id,
+        'assigned_to', tickets.assigned_to,
+        'priority_rank', tickets.priority_rank,
+        'updated_at', tickets.updated_at,
+        'created_by_username', creator.username,
+        'assigned_to_username', assignee.username,
+        'queue_name', queues.name,
+        'comments', (
+            SELECT json_group_array(json_object(
+                'id', c.id, 'user_id', c.user_id, 'username', commenter.username,
+                'content', c.content, 'created_at', c.created_at
+            ))
+            FROM (SELECT * FROM comments WHERE comments.ticket_id = tickets.id
+                  ORDER BY comments.created_at, comments.id) AS c
+            LEFT JOIN users AS commenter ON c.user_id = commenter.id
+        )
+    ) AS payload
+    FROM tickets
+    LEFT JOIN users AS creator ON tickets.created_by = creator.id
+    LEFT JOIN users AS assignee ON tickets.assigned_to = assignee.id
+    LEFT JOIN queues ON tickets.queue_id = queues.id
+    WHERE tickets.id = ?
+"""
+
+# Constant SQL text, so sqlite3's per-connection statement cache reuses the compiled
+# statement on pooled connections.
+_TOKEN_USER_SQL = 'SELECT id, username, password FROM users WHERE username = ?'
+
 @api.route('/token', methods=['POST'])
 def api_get_token():
     """
@@ -91,22 +245,23 @@ def api_get_token():
         JSON: {"access_token": "your_jwt_token"} on success (200).
               {"msg": "error_message"} on failure (400 or 401).
     """
-    data = request.json
-    if not data or not data.get('username') or not data.get('password'):
+    data = request.get_json(silent=True) # None for missing/malformed JSON (no BadRequest raised).
+    if not isinstance(data, dict) or not data.get('username') or not data.get('password'):
         return jsonify({'msg': 'Missing username or password in JSON payload.'}), 400
 
     username = data['username']
     password = data['password']
 
     # Fetch user from database using db_manager
-    user_record = db_manager.fetchone('SELECT id, username, password FROM users WHERE username = ?', (username,))
+    user_record = db_manager.fetchone(_TOKEN_USER_SQL, (username,))
 
     # --- !!! SECURITY WARNING !!! ---
     # The original code compared plaintext passwords: `user['password'] == data['password']`
     # This is highly insecure. Passwords MUST be stored hashed.
-    # The comparison MUST use a function like `check_password_hash`.
+    # The comparison MUST use a function like `check_password_hash` (wrapped by `verify_password`).
     # Assuming passwords in DB are hashed:
-    if user_record and check_password_hash(user_record['password'], password):
+    # Unknown usernames are checked against a dummy hash so both failure cases take equally long.
+    if verify_password(user_record['password'] if user_record else None, password):
         # Identity for the token can be user_id or any other unique identifier.
         access_token = create_access_token(identity=user_record['id'])
         current_app.logger.info(f"JWT token generated for user: {username} (ID: {user_record['id']})")
@@ -124,90 +279,136 @@ def api_get_tickets():
 
     Query Parameters:
         page (int, optional): Page number (default: 1).
-        per_page (int, optional): Number of tickets per page (default: 10).
+        per_page (int, optional): Number of tickets per page (default: 10, at most MAX_PER_PAGE).
         show_closed (bool, optional): 'true' to include closed tickets (default: 'false').
         assigned_to_me (bool, optional): 'true' to show only tickets assigned to the authenticated user.
+        after_created_at, after_id (int, optional): Keyset cursor. When both are given, returns the
+            tickets that come after the ticket with that (created_at, id) in list order, instead
+            of using `page`. Pass the `next_after_created_at`/`next_after_id` values of the
+            previous response to fetch the next page without any OFFSET cost.
 
     Returns:
         JSON: Paginated list of tickets and metadata.
+              Timestamps (created_at, deadline) are Unix epoch seconds.
     """
-    current_user_id = get_jwt_identity() # Get user ID from JWT.
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 10))
-    show_closed = request.args.get('show_closed', 'false').lower() == 'true'
-    assigned_to_me = request.args.get('assigned_to_me', 'false').lower() == 'true'
+    current_user_id = _current_user_id() # Get user ID from JWT.
+    # Typed lookups: malformed numbers fall back to the default instead of raising.
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 10, type=int), 1), MAX_PER_PAGE)
+    show_closed = request.args.get('show_closed', '').lower() in _TRUE_VALUES
+    assigned_to_me = request.args.get('assigned_to_me', '').lower() in _TRUE_VALUES
+    after_created_at = request.args.get('after_created_at', type=int)
+    after_id = request.args.get('after_id', type=int)
+    use_keyset = after_created_at is not None and after_id is not None
 
     assigned_filter_user_id = current_user_id if assigned_to_me else None
 
-    base_query = """
-        SELECT tickets.*, creator.username AS created_by_username, assignee.username AS assigned_to_username, queues.name AS queue_name
-        FROM tickets
-        LEFT JOIN users AS creator ON tickets.created_by = creator.id
-        LEFT JOIN users AS assignee ON tickets.assigned_to = assignee.id
-        LEFT JOIN queues ON tickets.queue_id = queues.id
-    """
-    conditions = []
-    params = []
+    # Count with the same filters (the keyset cursor only selects a window of them).
+    total_count = get_total_tickets_count(show_closed, assigned_filter_user_id)
 
-    if not show_closed:
-        conditions.append("LOWER(tickets.status) != ?")
-        params.append('closed')
-    
+    # Step 1 (deferred join): page through the bare tickets table to find the IDs on this page.
+    # Rows skipped by OFFSET are never joined with users/queues. Parameters follow the
+    # placeholder order of _PAGE_IDS_SQL: assignee, keyset cursor, LIMIT, OFFSET.
+    id_params = []
     if assigned_filter_user_id is not None:
-        conditions.append("tickets.assigned_to = ?")
-        params.append(assigned_filter_user_id)
-
-    if conditions:
-        base_query += " WHERE " + " AND ".join(conditions)
-    
-    # Add ordering, limit, and offset for pagination.
-    # Example order: newest tickets first.
-    query_with_pagination = base_query + " ORDER BY tickets.created_at DESC LIMIT ? OFFSET ?"
-    params_for_pagination = (*params, per_page, (page - 1) * per_page)
-
-    tickets_data = db_manager.fetchall(query_with_pagination, params_for_pagination)
-    total_count = get_total_tickets_count(show_closed, assigned_filter_user_id) # Get count with same filters.
-
-    current_app.logger.debug(f"API: User {current_user_id} fetched tickets. Page: {page}, Count: {len(tickets_data)}")
-    return jsonify({
-        'tickets': [dict(ticket) for ticket in tickets_data], # Convert sqlite3.Row to dict.
+        id_params.append(assigned_filter_user_id)
+    if use_keyset:
+        id_params.extend((after_created_at, after_id))
+    id_params.append(per_page)
+    if not use_keyset:
+        id_params.append((page - 1) * per_page)
+    id_query = _PAGE_IDS_SQL[show_closed, assigned_filter_user_id is not None, use_keyset]
+    page_ids = [row[0] for row in db_manager.fetchall_tuples(id_query, tuple(id_params))]
+
+    # Step 2: join only the rows that are actually returned.
+    tickets_data = []
+    if page_ids:
+        with get_database_connection(readonly=True) as conn: # A plain read: use the read-only pool.
+            cursor = conn.cursor()
+            cursor.row_factory = None # Plain tuples; dicts are built below with one shared key list.
+            # The IDs are passed as one JSON array, so the SQL text is the same for every page size.
+            cursor.execute(_PAGE_TICKETS_SQL, (orjson.dumps(page_ids).decode(),))
+            columns = tuple(description[0] for description in cursor.description)
+            tickets_data = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    logger = current_app.logger
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("API: User %s fetched tickets. Page: %s, Count: %s", current_user_id, page, len(tickets_data))
+    response = {
+        'tickets': tickets_data,
         'page': page,
         'per_page': per_page,
         'total_tickets': total_count,
         'total_pages': (total_count + per_page - 1) // per_page
-    }), 200
+    }
+    if tickets_data:
+        # Keyset cursor for the next page (see the after_created_at/after_id parameters).
+        response['next_after_created_at'] = tickets_data[-1]['created_at']
+        response['next_after_id'] = tickets_data[-1]['id']
+    # Serialized with orjson straight to bytes (no intermediate str, no stdlib json encoder).
+    return Response(orjson.dumps(response), status=200, mimetype='application/json')
 
 @api.route('/tickets/<int:ticket_id>', methods=['GET'])
 @jwt_required()
 def api_get_ticket(ticket_id):
     """
-    Retrieves details for a specific ticket by its ID.
+    Retrieves details for a specific ticket by its ID, including its comments.
     Requires JWT authentication.
 
+    The whole response document is built by SQLite (json_object / json_group_array)
+    in a single query, so no per-row Python dicts are created and the comments do
+    not need a second round-trip.
+
+    Supports conditional requests: the response carries a weak ETag and Last-Modified
+    derived from `tickets.updated_at` (bumped by triggers on ticket changes and new
+    comments). A request with a matching If-None-Match gets 304 Not Modified.
+    Renaming a user or queue does not change the ETag of tickets that reference it.
+
     Returns:
         JSON: Ticket details if found (200), or error message (404).
+              'comments' is a list of {id, user_id, username, content, created_at},
+              oldest first. Timestamps are Unix epoch seconds.
     """
-    current_user_id = get_jwt_identity()
-    # Fetch ticket details including related user and queue names.
-    query = """
-        SELECT tickets.*, creator.username AS created_by_username, assignee.username AS assigned_to_username, queues.name AS queue_name
-        FROM tickets
-        LEFT JOIN users AS creator ON tickets.created_by = creator.id
-        LEFT JOIN users AS assignee ON tickets.assigned_to = assignee.id
-        LEFT JOIN queues ON tickets.queue_id = queues.id
-        WHERE tickets.id = ?
-    """
-    ticket_data = db_manager.fetchone(query, (ticket_id,))
-
-    if ticket_data is None:
+    current_user_id = _current_user_id()
+    # Cheap version probe first: a client holding the current version gets a 304 without
+    # the joined/aggregated detail query being run.
+    version_row = db_manager.fetchone(TICKET_VERSION_SQL, (ticket_id,))
+    if version_row is None:
         current_app.logger.warning(f"API: User {current_user_id} failed to get ticket ID {ticket_id}: Not found.")
         return jsonify({'msg': 'Ticket not found.'}), 404
 
+    version = version_row['version']
+    etag = f"{ticket_id}-{int(version * 1000)}"
+    if request.if_none_match.contains_weak(etag):
+        not_modified = Response(status=304)
+        not_modified.set_etag(etag, weak=True)
+        return not_modified
+
+    ticket_payload = db_manager.fetchone(TICKET_DETAIL_JSON_SQL, (ticket_id,))
+    if ticket_payload is None: # Deleted between the two queries.
+        return jsonify({'msg': 'Ticket not found.'}), 404
+
     # TODO: Add authorization check: Does current_user_id have permission to view this ticket?
     #       This is important if tickets have restricted visibility.
 
-    current_app.logger.debug(f"API: User {current_user_id} fetched ticket ID {ticket_id}.")
-    return jsonify(dict(ticket_data)), 200
+    logger = current_app.logger
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("API: User %s fetched ticket ID %s.", current_user_id, ticket_id)
+    response = Response(ticket_payload['payload'], status=200, mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    response.last_modified = datetime.fromtimestamp(version, tz=timezone.utc)
+    return response
+
+# Ticket columns that may be changed through PUT /api/tickets/<id>.
+UPDATABLE_TICKET_FIELDS = frozenset(('title', 'description', 'status', 'priority', 'deadline', 'queue_id', 'assigned_to'))
+
+@lru_cache(maxsize=128)
+def _build_ticket_update_sql(fields):
+    """
+    Returns the UPDATE statement for a sorted tuple of field names (all from
+    UPDATABLE_TICKET_FIELDS, so safe to interpolate). Cached per field combination.
+    """
+    return f"UPDATE tickets SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ? RETURNING id"
 
 @api.route('/tickets/<int:ticket_id>', methods=['PUT'])
 @jwt_required()
@@ -222,7 +423,7 @@ def api_update_ticket(ticket_id):
             "description": "New Description", // Optional
             "status": "in progress", // Optional
             "priority": "high", // Optional
-            "deadline": "YYYY-MM-DDTHH:MM:SS", // Optional
+            "deadline": "YYYY-MM-DDTHH:MM:SS", // Optional (or Unix epoch seconds, or null)
             "queue_id": 1, // Optional
             "assigned_to": 2 // Optional (user ID)
         }
@@ -230,53 +431,78 @@ def api_update_ticket(ticket_id):
     Returns:
         JSON: Success message (200), or error (404 if ticket not found, 400 for bad data).
     """
-    current_user_id = get_jwt_identity()
-    data = request.json
-    if not data:
-        return jsonify({'msg': 'Request body must be JSON.'}), 400
-
-    # Check if ticket exists.
-    existing_ticket = db_manager.fetchone('SELECT id FROM tickets WHERE id = ?', (ticket_id,))
-    if existing_ticket is None:
-        current_app.logger.warning(f"API: User {current_user_id} failed to update ticket ID {ticket_id}: Not found.")
-        return jsonify({'msg': 'Ticket not found.'}), 404
+    current_user_id = _current_user_id()
+    data = request.get_json(silent=True) # None for missing/malformed JSON (no BadRequest raised).
+    if not data or not isinstance(data, dict):
+        return jsonify({'msg': 'Request body must be a JSON object.'}), 400
 
+    # Existence is checked by the UPDATE itself (RETURNING yields no row for an unknown ID).
     # TODO: Add authorization: Does current_user_id have permission to update this ticket?
 
-    fields_to_update = []
-    values_for_update = []
-    allowed_fields = ['title', 'description', 'status', 'priority', 'deadline', 'queue_id', 'assigned_to']
-    
-    # Dynamically build the SET part of the UPDATE query.
-    for field in allowed_fields:
-        if field in data:
-            # TODO: Add validation for each field's value (e.g., status in allowed_statuses, queue_id exists).
-            fields_to_update.append(f"{field} = ?")
-            values_for_update.append(data[field])
-
+    # Fields present in the payload, in a canonical (sorted) order so each combination
+    # maps to one cached UPDATE statement.
+    fields_to_update = tuple(sorted(data.keys() & UPDATABLE_TICKET_FIELDS))
     if not fields_to_update:
         return jsonify({'msg': 'No valid fields provided for update.'}), 400
 
+    values_for_update = []
+    for field in fields_to_update:
+        # TODO: Add validation for each field's value (e.g., status in allowed_statuses, queue_id exists).
+        value = data[field]
+        if field in ('status', 'priority') and isinstance(value, str):
+            value = value.lower() # Stored lowercase (see the CHECK constraints).
+        elif field == 'deadline':
+            try:
+                value = _deadline_to_epoch(value) # Stored as Unix epoch seconds.
+            except ValueError:
+                return jsonify({'msg': 'Invalid deadline format. Use YYYY-MM-DDTHH:MM:SS or epoch seconds.'}), 400
+        values_for_update.append(value)
+
     values_for_update.append(ticket_id) # Add ticket_id for the WHERE clause.
-    update_query = f"UPDATE tickets SET {', '.join(fields_to_update)} WHERE id = ?"
+    update_query = _build_ticket_update_sql(fields_to_update)
     
     try:
-        db_manager.execute_query(update_query, tuple(values_for_update))
+        with get_database_connection() as conn:
+            # The previous assignee is read in the UPDATE's transaction, so the notification check
+            # below compares against the value actually being replaced (the old code re-read it
+            # after the UPDATE and so always saw the new value). sqlite3 would only BEGIN before
+            # the UPDATE, leaving the SELECT outside the transaction, so it is opened (with the
+            # write lock) here: no concurrent update can change the assignee in between.
+            conn.execute("BEGIN IMMEDIATE")
+            previous = None
+            if 'assigned_to' in data:
+                previous = conn.execute("SELECT assigned_to FROM tickets WHERE id = ?", (ticket_id,)).fetchone()
+            updated_rows = conn.execute(update_query, tuple(values_for_update)).fetchall()
+
+        if not updated_rows:
+            current_app.logger.warning(f"API: User {current_user_id} failed to update ticket ID {ticket_id}: Not found.")
+            return jsonify({'msg': 'Ticket not found.'}), 404
+
+        mark_tickets_changed()
+        cache.delete_memoized(get_total_tickets_count) # Status/assignee changes alter the counts.
         # If 'assigned_to' was in data and changed, trigger notification.
         if 'assigned_to' in data and data['assigned_to'] is not None:
-             # Check if assignment actually changed to avoid redundant notifications.
-            original_assignee = db_manager.fetchone("SELECT assigned_to FROM tickets WHERE id = ?", (ticket_id,))
-            if original_assignee and original_assignee['assigned_to'] != data['assigned_to']:
-                current_app.logger.info(f"API: Ticket {ticket_id} assigned to user {data['assigned_to']} by user {current_user_id}. Queuing notification.")
-                run_in_app_context(current_app._get_current_object(), notify_assigned_user, ticket_id, 'assigned', current_user_id)
+            # Check if assignment actually changed to avoid redundant notifications.
+            if previous is not None and previous['assigned_to'] != data['assigned_to']:
+                current_app.logger.info("API: Ticket %s assigned to user %s by user %s. Queuing notification.",
+                                        ticket_id, data['assigned_to'], current_user_id)
+                enqueue_in_app_context(current_app._get_current_object(), notify_assigned_user, ticket_id, 'assigned', current_user_id)
 
-        current_app.logger.info(f"API: User {current_user_id} updated ticket ID {ticket_id}. Fields: {fields_to_update}")
+        current_app.logger.info("API: User %s updated ticket ID %s. Fields: %s", current_user_id, ticket_id, fields_to_update)
         return jsonify({'msg': 'Ticket updated successfully.'}), 200
     except Exception as e: # Catch database errors or other issues.
         current_app.logger.error(f"API: Error updating ticket ID {ticket_id} by user {current_user_id}: {e}", exc_info=True)
         return jsonify({'msg': f'Failed to update ticket: {str(e)}'}), 500
 
 
+# created_at is computed by SQLite (current Unix epoch seconds), and RETURNING hands back
+# the generated ID and timestamp from the same statement.
+WEBHOOK_INSERT_TICKET_SQL = """
+    INSERT INTO tickets (title, description, status, priority, queue_id, assigned_to, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+    RETURNING id, created_at
+"""
+
 @api.route('/webhook/create-ticket', methods=['POST'])
 def webhook_create_ticket():
     """
@@ -297,32 +523,32 @@ def webhook_create_ticket():
         JSON: Success message with ticket_id (201), or error (400, 401, 500).
     """
     # --- Webhook Authentication ---
-    provided_token = request.headers.get('X-Webhook-Token')
-    expected_token = os.getenv('WEBHOOK_SECRET')
+    provided_token = (request.headers.get('X-Webhook-Token') or '').encode('utf-8')
+    expected_token = _webhook_secret_bytes() # Read from the environment once, not per request.
 
     if not expected_token:
         current_app.logger.critical("WEBHOOK_SECRET environment variable is not set. Webhook endpoint is insecure and will not function.")
         return jsonify({'msg': 'Webhook endpoint not configured properly on server.'}), 503 # Service Unavailable
 
-    # Securely compare tokens to prevent timing attacks.
-    # `hmac.compare_digest` is preferred, but direct comparison is common for simple secrets.
-    # For this example, direct comparison is used, but note the security implication.
-    if not provided_token or not expected_token or provided_token != expected_token:
+    # Securely compare tokens to prevent timing attacks: `hmac.compare_digest` takes the
+    # same time wherever the first differing byte is.
+    if not provided_token or not hmac.compare_digest(provided_token, expected_token):
         current_app.logger.warning("Webhook unauthorized: Missing or incorrect X-Webhook-Token.")
         return jsonify({'msg': 'Unauthorized: Invalid or missing webhook token.'}), 401
 
     # --- Process Request Data ---
-    data = request.json
-    if not data:
-        current_app.logger.warning("Webhook bad request: No JSON payload received.")
+    data = request.get_json(silent=True) # None for missing/malformed JSON (no BadRequest raised).
+    if not data or not isinstance(data, dict):
+        current_app.logger.warning("Webhook bad request: No JSON object payload received.")
         return jsonify({'error': 'Request body must be valid JSON.'}), 400
 
     title = data.get('title')
     description = data.get('description')
     queue_id = data.get('queue_id') # This is expected to be an integer ID.
     # Optional fields with defaults.
-    status = data.get('status', 'open')
-    priority = data.get('priority', 'medium')
+    # Status and priority are stored lowercase (see the CHECK constraints on tickets).
+    status = str(data.get('status') or 'open').lower()
+    priority = str(data.get('priority') or 'medium').lower()
     assigned_to_user_id = data.get('assigned_to') # Optional: User ID for assignment.
 
     # Validate required fields.
@@ -338,31 +564,33 @@ def webhook_create_ticket():
     try:
         # Insert the new ticket into the database.
         # 'created_by' is not set by this webhook; DB schema should handle default or allow NULL.
-        # 'created_at' should be set by the database or application logic (e.g., datetime.now().isoformat()).
-        from datetime import datetime
-        created_at_iso = datetime.now().isoformat()
-
-        new_ticket_id = db_manager.insert(
-            '''INSERT INTO tickets (title, description, status, priority, queue_id, assigned_to, created_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)''',
-            (title, description, status, priority, queue_id, assigned_to_user_id, created_at_iso)
-        )
+        # 'created_at' (Unix epoch seconds) is set by SQLite and returned with the new ID by
+        # RETURNING, so no Python clock read or follow-up SELECT is needed.
+        with get_database_connection() as conn:
+            new_ticket = conn.execute(WEBHOOK_INSERT_TICKET_SQL, (
+                title, description, status, priority, queue_id, assigned_to_user_id
+            )).fetchall()[0]
+        new_ticket_id = new_ticket['id']
+        mark_tickets_changed()
+        cache.delete_memoized(get_total_tickets_count)
 
         log_extra_webhook = {
             'created_ticket_id': new_ticket_id,
+            'created_at': new_ticket['created_at'],
             'webhook_payload': data, # Log the received payload for debugging.
             'assigned_to_user_id': assigned_to_user_id
         }
-        current_app.logger.info(f"Ticket (ID: {new_ticket_id}) created successfully via webhook.", extra=log_extra_webhook)
+        current_app.logger.info("Ticket (ID: %s) created successfully via webhook.", new_ticket_id, extra=log_extra_webhook)
 
         # If a user was assigned, trigger a notification.
         if new_ticket_id and assigned_to_user_id:
             current_app.logger.info(
-                f"Webhook: Queuing 'assigned' notification for new ticket {new_ticket_id} to user {assigned_to_user_id}.",
+                "Webhook: Queuing 'assigned' notification for new ticket %s to user %s.",
+                new_ticket_id, assigned_to_user_id,
                 extra=log_extra_webhook
             )
             # `triggering_user_id` is None as this is a system action (webhook).
-            run_in_app_context(
+            enqueue_in_app_context(
                 current_app._get_current_object(), # Pass the Flask app instance.
                 notify_assigned_user,
                 new_ticket_id,
@@ -371,7 +599,8 @@ def webhook_create_ticket():
             )
         elif new_ticket_id:
             current_app.logger.info(
-                f"Webhook: Ticket {new_ticket_id} created. No user assigned, so no 'assigned' notification sent.",
+                "Webhook: Ticket %s created. No user assigned, so no 'assigned' notification sent.",
+                new_ticket_id,
                 extra=log_extra_webhook
             )
 
@@ -13,8 +13,28 @@ appropriate configuration based on an environment variable (e.g., FLASK_ENV).
 
 For this example, only a single base `Config` class is provided.
 """
-import os
 from datetime import timedelta # For JWT_ACCESS_TOKEN_EXPIRES
+from pathlib import Path
+from app.env import ENV # Environment variables, parsed once.
+
+# --- Paths and Limits Resolved Once at Import ---
+# Project root (the directory containing app/, routes/ and templates/), independent of the
+# process's working directory.
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Default upload directory. Use `UPLOAD_FOLDER_PATH / filename` where a Path is convenient;
+# `Config.UPLOAD_FOLDER` holds the same location as a string.
+UPLOAD_FOLDER_PATH = PROJECT_ROOT / 'uploads'
+# Maximum accepted request body (and therefore upload) size: 10 MB.
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# File extensions permitted for uploads, lowercase. The single definition: Config and
+# utils.files use this object. A frozenset is immutable, so it can be shared safely.
+ALLOWED_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'pdf', 'docx', 'xlsx', 'pptx', 'txt', 'log', 'csv', 'zip', 'rar'})
+# Length of the longest allowed extension; longer suffixes are rejected without a set lookup.
+MAX_EXT_LEN = max(map(len, ALLOWED_EXTENSIONS))
+
+# Fallback SECRET_KEY for development. Exported so the factory can warn when it is in use.
+DEV_SECRET_KEY = 'a-very-unsafe-default-dev-secret-key-CHANGE-ME'
 
 class Config:
     """
@@ -26,42 +46,35 @@ class Config:
     # SECRET_KEY: A secret key for signing session cookies, CSRF tokens, etc.
     # CRITICAL: This MUST be a strong, unique, and random string in production.
     # It should be loaded from an environment variable and NOT hardcoded.
-    SECRET_KEY = os.getenv('SECRET_KEY', 'a-very-unsafe-default-dev-secret-key-CHANGE-ME')
+    SECRET_KEY = ENV.secret_key if ENV.secret_key is not None else DEV_SECRET_KEY
     # The fallback 'dev-secret-key' is highly insecure and only for development convenience.
     # A warning should be logged in app/__init__.py if this default is used.
 
     # JWT_SECRET_KEY: Secret key specifically for signing JSON Web Tokens (JWTs).
     # CRITICAL: Similar to SECRET_KEY, this must be strong, unique, and kept secret.
-    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'another-unsafe-default-jwt-secret-key-CHANGE-ME')
+    JWT_SECRET_KEY = ENV.jwt_secret_key if ENV.jwt_secret_key is not None else 'another-unsafe-default-jwt-secret-key-CHANGE-ME'
     # The fallback is insecure and only for development.
 
     # --- File Upload Settings ---
     # UPLOAD_FOLDER: The directory where uploaded files will be stored.
-    # Note: The path `os.path.join(os.getcwd(), 'uploads')` might not be ideal if the
-    # application's working directory changes or if deployed in complex environments.
-    # It's often better to define this relative to the application root or use an
-    # absolute path configured via an environment variable or derived from `data_dir`
-    # as done in `app/__init__.py`. This setting here might be overridden by `app/__init__.py`.
-    UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), '..', 'uploads_from_config')
-    # ^ Example of a path relative to the project root, assuming 'config.py' is in 'app/'.
-    # However, `app.config["UPLOAD_FOLDER"] = os.path.join(data_dir, "uploads")` in `app/__init__.py`
-    # will likely take precedence if `app.config.from_object(Config)` is called before that line.
+    # Resolved from this file's location (see UPLOAD_FOLDER_PATH above), so it does not depend
+    # on the working directory the server was started from.
+    # Note: `app.config["UPLOAD_FOLDER"] = os.path.join(data_dir, "uploads")` in `app/__init__.py`
+    # takes precedence there; the package factory keeps uploads under DATA_DIR.
+    UPLOAD_FOLDER = str(UPLOAD_FOLDER_PATH)
 
     # MAX_CONTENT_LENGTH: Maximum allowed size for uploaded files (in bytes).
-    # 10 * 1024 * 1024 = 10 MB.
-    MAX_CONTENT_LENGTH = 10 * 1024 * 1024
+    MAX_CONTENT_LENGTH = MAX_UPLOAD_BYTES
 
-    # ALLOWED_EXTENSIONS: A set of file extensions permitted for uploads.
-    # This is used by the `utils.files.allowed_file()` function.
-    # Note: `utils.files.py` also defines an `ALLOWED_EXTENSIONS`. Ensure consistency
-    # or decide on a single source of truth for this setting (e.g., load from app.config).
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'docx', 'xlsx', 'pptx', 'txt', 'log', 'csv', 'zip', 'rar'}
+    # ALLOWED_EXTENSIONS: The file extensions permitted for uploads (module-level constant above).
+    # This is used by the `utils.files.allowed_file()` function, which imports the same object.
+    ALLOWED_EXTENSIONS = ALLOWED_EXTENSIONS
 
 
     # --- JWT Configuration ---
     # JWT_ACCESS_TOKEN_EXPIRES: Duration for which an access token is valid.
     # Can be an integer (seconds) or a `timedelta` object.
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=int(os.getenv('JWT_TOKEN_EXPIRE_HOURS', '1'))) # e.g., 1 hour
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=ENV.jwt_token_expire_hours) # e.g., 1 hour
 
 
     # --- Session Cookie Security Settings ---
@@ -69,7 +82,10 @@ class Config:
 
     # SESSION_COOKIE_SECURE: If True, the session cookie will only be sent over HTTPS.
     # CRITICAL for production: Set to True if your application is served over HTTPS.
-    SESSION_COOKIE_SECURE = os.getenv('SESSION_COOKIE_SECURE', 'True').lower() == 'true' # Default to True for production readiness
+    # From the SESSION_COOKIE_SECURE environment variable; when unset, True only with
+    # FLASK_ENV=production. Browsers drop Secure cookies received over plain HTTP, which
+    # would break login and CSRF on an HTTP-only deployment (e.g., the default docker-compose).
+    SESSION_COOKIE_SECURE = ENV.session_cookie_secure
 
     # SESSION_COOKIE_HTTPONLY: If True, the session cookie cannot be accessed by client-side JavaScript.
     # Helps mitigate Cross-Site Scripting (XSS) attacks. Highly recommended to be True.
@@ -5,20 +5,39 @@ This module provides a `DatabaseManager` class and a `get_database_connection`
 context manager to handle SQLite database connections, query execution,
 and transaction management. It aims to abstract direct SQLite operations
 and provide a consistent interface for database access.
+
+Each pooled connection keeps a cache of prepared statements keyed by the SQL
+text (`STATEMENT_CACHE_SIZE`), so a query is parsed once per connection rather
+than on every call. Callers get the most out of it by passing identical SQL
+strings, preferably module-level constants, with values bound as `?`
+parameters: SQL built with f-strings or string concatenation produces a new
+text, and a new prepared statement, for every distinct value.
 """
 import sqlite3
 import os
+import atexit
+import queue
+import threading
+import time
+from urllib.request import pathname2url # Database path -> URI path for read-only connections.
 from flask import current_app
 import logging
 from contextlib import contextmanager
 
+# (app config object, validated DATABASE path) of the last lookup. The path is fixed once an
+# app is configured, so later calls only compare the config object's identity; another app
+# (e.g., in tests) has a different config object and is resolved afresh.
+_cached_db_path = None
+
+
 def _get_db_path_for_manager():
     """
     Retrieves and validates the database path from the Flask app configuration.
 
     This internal helper function is used by `get_database_connection` to
     determine the location of the SQLite database file. It relies on
-    `current_app.config['DATABASE']` being set.
+    `current_app.config['DATABASE']` being set. The result is cached for the
+    current app's config (see `_cached_db_path`).
 
     Returns:
         str: The path to the SQLite database file.
@@ -26,131 +45,312 @@ def _get_db_path_for_manager():
     Raises:
         RuntimeError: If the application context or 'DATABASE' config is not available or invalid.
     """
-    # Ensure Flask application context and its config are accessible.
-    if not hasattr(current_app, 'config'):
-        # This error indicates a fundamental issue, likely that the function is called
-        # too early in the app lifecycle or outside of a request/app context.
-        raise RuntimeError("DBManager: Application context or config not available for _get_db_path_for_manager.")
-
-    db_path_config = current_app.config.get('DATABASE')
-
-    # Log the configured and resolved absolute path for debugging and clarity.
-    if db_path_config:
-        abs_db_path = os.path.abspath(db_path_config)
-        current_app.logger.debug(f"DBManager: Original DATABASE config path: '{db_path_config}', Resolved absolute path: '{abs_db_path}'")
-    else:
-        current_app.logger.warning("DBManager: 'DATABASE' key in Flask app.config is None or empty.")
+    global _cached_db_path
+    # Outside an application context, Flask's `current_app` proxy itself raises RuntimeError
+    # ("Working outside of application context"), so no separate check is needed.
+    config = current_app.config
+    cached = _cached_db_path
+    if cached is not None and cached[0] is config:
+        return cached[1]
+
+    db_path_config = config.get('DATABASE')
 
     # The database path must be configured.
     if not db_path_config:
+        current_app.logger.warning("DBManager: 'DATABASE' key in Flask app.config is None or empty.")
         raise RuntimeError("DBManager: 'DATABASE' key not found, not configured, or empty in current_app.config.")
+
+    # Log the configured and resolved absolute path for debugging and clarity (once per app).
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        current_app.logger.debug("DBManager: Original DATABASE config path: '%s', Resolved absolute path: '%s'", db_path_config, os.path.abspath(db_path_config))
+    _cached_db_path = (config, db_path_config)
     return db_path_config
 
 
+# --- Connection Pool ---
+# Opening a SQLite connection and configuring it costs more than most of the queries this
+# application runs, and several queries are issued per request. Connections are therefore
+# kept open and reused: each database path has a small LIFO pool of idle connections
+# (LIFO so the most recently used connection, with the warmest page cache, is reused first).
+# A connection is borrowed for the duration of one `get_database_connection()` block, so it
+# is only ever used by one thread at a time; `check_same_thread=False` allows a different
+# request thread to borrow it later.
+#
+# There are two pools per path: read-write connections for writes (and for callers that
+# need a transaction), and read-only connections (`mode=ro`) for `fetchone`/`fetchall`.
+# With WAL, any number of readers run alongside the single writer, so the read pool is the
+# larger one; opening readers with `mode=ro` also guarantees a SELECT helper can never write.
+#
+# Shared-cache mode (`cache=shared`) is deliberately not used. It replaces WAL's concurrent
+# readers with table-level locks inside the process (a reader fails with SQLITE_LOCKED while
+# the writer holds the table, instead of reading the last committed snapshot), and SQLite
+# discourages it. Pooled connections keep their own page cache warm across requests, and
+# `mmap_size` lets all connections read the same OS page cache, so fresh connections are rare
+# and do not start from cold disk reads.
+
+# Maximum number of idle read-write connections kept per database path and process.
+# More connections can be open at once under load; extra ones are closed when returned.
+POOL_MAX_IDLE_CONNECTIONS = 8
+# Maximum number of idle read-only connections kept per database path and process.
+READ_POOL_MAX_IDLE_CONNECTIONS = min(32, (os.cpu_count() or 1) * 4)
+
+# Prepared statements cached per connection (sqlite3's default is 128). Pooled connections
+# live for the whole process, so every distinct query the application issues can stay
+# prepared; this is comfortably above the number of distinct SQL strings in the code.
+STATEMENT_CACHE_SIZE = 256
+
+# Applied once when a physical connection is opened, not on every borrow.
+# - WAL journal: readers do not block the writer and the writer does not block readers.
+# - synchronous=NORMAL: safe with WAL (no corruption on crash; only the last commits may be lost
+#   on power failure) and avoids an fsync per transaction.
+# - temp_store/mmap_size/cache_size: temporary b-trees in memory, up to 256 MB memory-mapped
+#   reads, and a page cache of up to 64 MB (negative value = KiB) that persists across reuse.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+)
+# The same PRAGMAs as one script, so a new connection is configured in a single call.
+_CONNECTION_PRAGMAS_SCRIPT = ";\n".join(CONNECTION_PRAGMAS) + ";"
+
+# The WAL journal mode is stored in the database file, so it only has to be set once per
+# path and process; later connections open the file in WAL mode already. In-memory
+# databases cannot use WAL and are skipped.
+_wal_enabled_paths = set()
+
+# `PRAGMA optimize` re-runs ANALYZE for tables whose statistics have drifted (and does nothing
+# otherwise), keeping query plans good as the data grows. SQLite recommends running it before
+# a long-lived connection closes and periodically on connections that stay open, so it runs on
+# every read-write connection that is closed and, at most once per interval and path, on a
+# read-write connection being returned to the pool. Read-only connections cannot store the
+# statistics and are skipped.
+OPTIMIZE_INTERVAL_SECONDS = 3 * 60 * 60
+# Monotonic time of the last periodic `PRAGMA optimize`, per database path.
+_last_optimize = {}
+
+# Idle connections keyed by (database path, read-only flag).
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(db_path, readonly=False):
+    """Returns the idle-connection pool for `db_path` (read-only or read-write), creating it on first use."""
+    key = (db_path, readonly)
+    pool = _pools.get(key)
+    if pool is None:
+        maxsize = READ_POOL_MAX_IDLE_CONNECTIONS if readonly else POOL_MAX_IDLE_CONNECTIONS
+        with _pools_lock:
+            pool = _pools.setdefault(key, queue.LifoQueue(maxsize=maxsize))
+    return pool
+
+
+def _is_memory_database(db_path):
+    """True for SQLite in-memory database names (':memory:' or a URI with mode=memory)."""
+    return db_path == ':memory:' or 'mode=memory' in db_path
+
+
+def _open_connection(db_path, logger, readonly=False):
+    """
+    Opens and configures a new physical connection to `db_path`.
+
+    Read-only connections are opened through a `file:...?mode=ro` URI, so the database
+    file must already exist (init_db() creates it at startup).
+
+    Raises:
+        RuntimeError: If the connection cannot be configured or is unusable.
+    """
+    logger.debug("DBManager: Opening new pooled %s connection to '%s'", 'read-only' if readonly else 'read-write', db_path)
+    if readonly and not _is_memory_database(db_path):
+        # Each in-memory connection is a separate database, so those are never read-only.
+        # isolation_level=None (autocommit): sqlite3 never issues BEGIN/COMMIT on these
+        # connections, so each SELECT runs in its own implicit read transaction (snapshot) and
+        # the commit in get_database_connection() has nothing to do.
+        try:
+            conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True,
+                                   timeout=10, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE,
+                                   isolation_level=None)
+        except sqlite3.Error as open_e:
+            raise RuntimeError(f"Failed to open read-only db connection to '{db_path}': {open_e}") from open_e
+    else:
+        # isolation_level="IMMEDIATE": the transaction sqlite3 opens implicitly before the first
+        # INSERT/UPDATE/DELETE/REPLACE is `BEGIN IMMEDIATE`, which takes the write lock up
+        # front (waiting up to `timeout` seconds for it). A deferred transaction can instead
+        # fail with "database is locked" when it has to upgrade its read lock mid-transaction,
+        # which the busy timeout does not retry. Read-only connections never write and keep the
+        # default.
+        conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False, # Added timeout
+                               cached_statements=STATEMENT_CACHE_SIZE, isolation_level="IMMEDIATE")
+    conn.row_factory = sqlite3.Row # Access columns by name.
+    try:
+        # Foreign key enforcement is crucial for data integrity; the other PRAGMAs are tuning.
+        conn.executescript(_CONNECTION_PRAGMAS_SCRIPT)
+        if not readonly and db_path not in _wal_enabled_paths and not _is_memory_database(db_path):
+            # Switching to WAL needs an exclusive lock and fails at once with "database is locked"
+            # (the busy timeout does not apply) while another worker is writing, e.g. when several
+            # gunicorn workers run init_db() together. WAL is only tuning, so keep the connection
+            # and let the next new connection retry the switch.
+            try:
+                journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            except sqlite3.OperationalError as wal_e:
+                logger.warning("DBManager: Could not enable WAL for '%s' yet: %s", db_path, wal_e)
+            else:
+                if journal_mode.lower() == 'wal':
+                    _wal_enabled_paths.add(db_path)
+                else:
+                    logger.warning("DBManager: Could not enable WAL for '%s' (journal_mode is '%s').", db_path, journal_mode)
+    except sqlite3.Error as pragma_e:
+        # The RuntimeError below carries the traceback to the caller; log one line here.
+        logger.error("DBManager: Error configuring new connection to '%s': %s", db_path, pragma_e)
+        conn.close()
+        raise RuntimeError(f"Failed to configure db connection to '{db_path}': {pragma_e}") from pragma_e
+    logger.debug("DBManager: Connection object created for '%s'. Conn id: %s", db_path, id(conn))
+    return conn
+
+
+def _optimize_connection(db_path, conn, logger):
+    """Runs `PRAGMA optimize` on a read-write connection. Failures are logged and ignored."""
+    try:
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error as e: # e.g., the database is busy; statistics are refreshed next time.
+        logger.warning("DBManager: PRAGMA optimize failed for '%s': %s", db_path, e)
+
+
+def _close_connection(db_path, conn, logger, readonly=False):
+    """Closes a physical connection, running `PRAGMA optimize` first on read-write connections."""
+    if not readonly:
+        _optimize_connection(db_path, conn, logger)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def _acquire_connection(db_path, logger, readonly=False):
+    """Borrows an idle connection to `db_path` from the matching pool, or opens a new one."""
+    try:
+        return _get_pool(db_path, readonly).get_nowait()
+    except queue.Empty:
+        return _open_connection(db_path, logger, readonly)
+
+
+def _release_connection(db_path, conn, logger, readonly=False):
+    """
+    Returns a connection to its pool, or closes it if the pool is full or the
+    connection is no longer usable.
+    """
+    try:
+        if conn.in_transaction: # Never hand out a connection with an open transaction.
+            conn.rollback()
+        if not readonly:
+            # Periodic optimize for connections that stay pooled (and so are rarely closed).
+            now = time.monotonic()
+            if now - _last_optimize.setdefault(db_path, now) >= OPTIMIZE_INTERVAL_SECONDS:
+                _last_optimize[db_path] = now
+                _optimize_connection(db_path, conn, logger)
+        _get_pool(db_path, readonly).put_nowait(conn)
+        if logger.isEnabledFor(logging.DEBUG): # Runs after every query; skip id() otherwise.
+            logger.debug("DBManager: Connection returned to pool for '%s'. Conn id: %s", db_path, id(conn))
+    except queue.Full:
+        _close_connection(db_path, conn, logger, readonly)
+        logger.debug("DBManager: Pool full; connection to '%s' closed. Conn id: %s", db_path, id(conn))
+    except sqlite3.Error as e: # Broken/closed connection: drop it.
+        logger.warning("DBManager: Discarding unusable connection to '%s': %s", db_path, e)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def close_pooled_connections():
+    """
+    Closes all idle pooled connections (e.g., at shutdown or between tests), running
+    `PRAGMA optimize` on the read-write ones first.
+    Connections currently borrowed are closed when returned only if the pool is full.
+    """
+    logger = current_app.logger if current_app else logging.getLogger(__name__)
+    with _pools_lock:
+        pools = list(_pools.items())
+    for (db_path, readonly), pool in pools:
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            _close_connection(db_path, conn, logger, readonly)
+
+
+# Close (and optimize) the idle connections when the worker process exits.
+atexit.register(close_pooled_connections)
+
+
 @contextmanager
-def get_database_connection():
+def get_database_connection(readonly=False):
     """
     Provides and manages a database connection using a context manager.
 
+    Args:
+        readonly (bool): Borrow from the read-only pool. Any write on such a connection
+            fails with `sqlite3.OperationalError`. Defaults to False (read-write).
+
     This function handles the lifecycle of a database connection:
-    1. Establishes a connection to the SQLite database specified in Flask app config.
-    2. Sets `conn.row_factory = sqlite3.Row` to allow dictionary-like access to columns.
-    3. Enables foreign key constraints (`PRAGMA foreign_keys = ON`).
-    4. Yields the connection for use within a `with` statement.
-    5. Commits the transaction if no exceptions occur.
-    6. Rolls back the transaction if any exception occurs.
-    7. Ensures the connection is closed in all cases (success or failure).
+    1. Borrows a pooled connection to the SQLite database specified in Flask app config,
+       or opens a new one. New connections get `conn.row_factory = sqlite3.Row` (dictionary-like
+       access to columns) and the `CONNECTION_PRAGMAS` (foreign keys, WAL, ...) once.
+    2. Yields the connection for use within a `with` statement.
+    3. Commits the transaction if no exceptions occur.
+    4. Rolls back the transaction if any exception occurs.
+    5. Returns the connection to the pool in all cases (success or failure).
+
+    Code that changes per-connection state (e.g., `PRAGMA foreign_keys`) must restore it
+    before the block ends, since the connection is reused.
 
     Yields:
         sqlite3.Connection: An active SQLite database connection object.
 
     Raises:
         RuntimeError: If connection fails, PRAGMA fails, or connection becomes unusable.
-        sqlite3.Error: Re-raises SQLite-specific errors after attempting rollback.
-        Exception: Re-raises other exceptions after attempting rollback.
+        sqlite3.Error, Exception: Re-raises any error from the block (or the commit) after
+            attempting rollback; it is logged here without a traceback.
     """
     logger = current_app.logger if current_app else logging.getLogger(__name__) # Fallback logger.
 
-    # Debugging information about the application and config context.
-    app_id = id(current_app) if current_app else "N/A"
-    config_id = id(current_app.config) if hasattr(current_app, 'config') else "N/A"
-    logger.debug(f"DBManager: get_database_connection called. current_app id: {app_id}, config id: {config_id}")
-
-    db_path = _get_db_path_for_manager() # Get database path.
-    logger.debug(f"DBManager: Resolved db_path for connection: '{db_path}'")
+    db_path = _get_db_path_for_manager() # Get database path (cached per app).
+    # Checked once per block; the per-query debug lines below are skipped entirely otherwise.
+    debug = logger.isEnabledFor(logging.DEBUG)
 
     conn = None # Initialize connection variable.
     try:
-        logger.debug(f"DBManager: Attempting sqlite3.connect(db_path='{db_path}')")
-        conn = sqlite3.connect(db_path, timeout=10) # Added timeout
-        conn.row_factory = sqlite3.Row # Access columns by name.
-        logger.debug(f"DBManager: Connection object created for '{db_path}'. Conn id: {id(conn)}")
-
-        # Enable foreign key constraint enforcement for this connection.
-        # This is crucial for data integrity.
-        try:
-            conn.execute("PRAGMA foreign_keys = ON")
-            logger.debug(f"DBManager: PRAGMA foreign_keys=ON executed for '{db_path}'")
-        except sqlite3.Error as pragma_e:
-            logger.error(f"DBManager: Error executing PRAGMA foreign_keys=ON for '{db_path}': {pragma_e}", exc_info=True)
-            if conn: conn.close() # Close connection if PRAGMA fails.
-            raise RuntimeError(f"Failed to set PRAGMA foreign_keys on db connection to '{db_path}': {pragma_e}") from pragma_e
-
-        # Perform a quick test query to ensure the connection is usable after PRAGMA.
-        try:
-            test_cursor = conn.cursor()
-            test_cursor.execute("SELECT 1")
-            test_cursor.fetchone()
-            logger.debug(f"DBManager: Post-PRAGMA test query on connection to '{db_path}' SUCCEEDED.")
-        except sqlite3.Error as test_e:
-            logger.error(f"DBManager: Post-PRAGMA test query on connection to '{db_path}' FAILED: {test_e}", exc_info=True)
-            if conn: conn.close()
-            raise RuntimeError(f"Connection to '{db_path}' became unusable after PRAGMA/connect: {test_e}") from test_e
-
-        # Check if connection is live before yielding (addresses potential pre-closure issues).
-        try:
-            current_total_changes = conn.total_changes
-            logger.debug(f"DBManager: Connection appears live before yield for '{db_path}'. total_changes: {current_total_changes}. Yielding connection.")
-        except sqlite3.ProgrammingError as pe_before_yield:
-            # This indicates the connection was closed unexpectedly.
-            logger.error(f"DBManager: CRITICAL - Connection to '{db_path}' IS CLOSED before yield! Error: {pe_before_yield}", exc_info=True)
-            if conn: conn.close() # Ensure it's closed if not already.
-            raise RuntimeError(f"Connection to '{db_path}' was closed before it could be yielded.") from pe_before_yield
+        conn = _acquire_connection(db_path, logger, readonly)
+        # No liveness probe here: pooled connections are only closed after being taken out of
+        # the pool (see _release_connection/close_pooled_connections), and a genuinely broken
+        # connection surfaces as sqlite3.Error from the real query below and is discarded.
 
         yield conn # Provide the connection to the `with` block.
 
         # If the `with` block completes without exceptions, commit the transaction.
-        logger.debug(f"DBManager: Returned from yield for '{db_path}'. Attempting commit. Conn id: {id(conn)}")
+        if debug:
+            logger.debug("DBManager: Returned from yield for '%s'. Attempting commit. Conn id: %s", db_path, id(conn))
         conn.commit()
-        logger.debug(f"DBManager: Transaction committed successfully for '{db_path}'")
-    except sqlite3.Error as e:
-        # Handle SQLite-specific errors.
-        logger.error(f"DBManager: SQLite error occurred with database '{db_path}': {e}", exc_info=True)
+        if debug:
+            logger.debug("DBManager: Transaction committed successfully for '%s'", db_path)
+    except BaseException as e:
+        # One warning without a traceback: the exception is re-raised, and the handler that
+        # finally deals with it (view, decorator or Flask error handler) logs the traceback once.
+        logger.warning("DBManager: Rolling back transaction on '%s' after %s: %s", db_path, type(e).__name__, e)
         if conn:
             try:
-                conn.rollback() # Rollback transaction on SQLite error.
-                logger.debug(f"DBManager: Transaction rolled back for '{db_path}' due to SQLite error.")
+                conn.rollback()
             except sqlite3.Error as rb_e:
-                logger.error(f"DBManager: Error during rollback for '{db_path}' (SQLite error path): {rb_e}", exc_info=True)
-        raise # Re-raise the original SQLite error.
-    except Exception as e:
-        # Handle any other non-SQLite exceptions.
-        logger.error(f"DBManager: A non-SQLite error occurred with database '{db_path}': {e}", exc_info=True)
-        if conn:
-            try:
-                conn.rollback() # Rollback transaction on other errors.
-                logger.debug(f"DBManager: Transaction rolled back for '{db_path}' due to non-SQLite error.")
-            except sqlite3.Error as rb_e:
-                 logger.error(f"DBManager: Error during rollback (non-SQLite error path) for '{db_path}': {rb_e}", exc_info=True)
-        raise # Re-raise the original non-SQLite error.
+                logger.error("DBManager: Error during rollback for '%s': %s", db_path, rb_e)
+        raise # Re-raise the original error.
     finally:
-        # Ensure the connection is always closed, whether an error occurred or not.
+        # Always hand the connection back, whether an error occurred or not.
         if conn:
-            logger.debug(f"DBManager: Closing connection in finally block for '{db_path}'. Conn id: {id(conn)}")
-            conn.close()
-            logger.debug(f"DBManager: Connection to '{db_path}' closed.")
+            _release_connection(db_path, conn, logger, readonly)
         else:
-            logger.debug(f"DBManager: No active connection object to close in finally block for '{db_path}' (conn was None).")
+            logger.debug("DBManager: No active connection object to release in finally block for '%s' (conn was None).", db_path)
 
 
 class DatabaseManager:
@@ -168,45 +368,33 @@ class DatabaseManager:
         self.logger = current_app.logger if current_app else logging.getLogger(__name__)
         self.logger.debug("DatabaseManager instance created.")
 
-    def _execute_raw_query(self, query_type, query, params=None):
+    def _log_query_error(self, method, query, error):
+        """
+        Logs a failed statement (without a traceback, which the handler of the re-raised
+        error logs); the caller re-raises and the context manager rolls back.
+        """
+        self.logger.error("DBManager: %s - SQLite error during execution: %s - %s", method, query, error)
+
+    def _execute_many(self, query_type, query, seq_of_params):
         """
-        Internal helper to execute queries and handle common cursor logic.
+        Internal helper for the bulk methods: runs `query` once per parameter tuple with
+        `conn.executemany`, on one connection and in one transaction (one commit for
+        all rows). Logs the row count once instead of once per row.
         Not meant to be called directly from outside.
         """
-        params = params or ()
-        self.logger.debug(f"DBManager: _execute_raw_query (type: {query_type}): {query} with params: {params}")
         with get_database_connection() as conn:
-            # The check `conn.total_changes` before cursor creation was a debug step.
-            # It can be useful to ensure the connection object `conn` is still valid
-            # if there were prior issues with connection management.
-            try:
-                self.logger.debug(f"DBManager: _execute_raw_query - conn.total_changes: {conn.total_changes}. Conn id: {id(conn)}")
-            except sqlite3.ProgrammingError as pe: # Indicates connection might be closed
-                self.logger.error(f"DBManager: _execute_raw_query - Connection is closed before cursor creation! Error: {pe}. Conn id: {id(conn)}", exc_info=True)
-                raise # Re-raise to indicate a critical failure.
-
-            cursor = conn.cursor()
             try:
-                cursor.execute(query, params)
-                self.logger.debug(f"DBManager: _execute_raw_query - Query executed. Rowcount (if applicable): {cursor.rowcount}")
-                
-                if query_type == "fetchone":
-                    return cursor.fetchone()
-                elif query_type == "fetchall":
-                    return cursor.fetchall()
-                elif query_type == "insert":
-                    return cursor.lastrowid
-                elif query_type in ["update", "delete", "execute_query"]: # execute_query for DDL/general
-                    return cursor.rowcount
-                else: # Should not happen
-                    raise ValueError(f"Unsupported query_type: {query_type}")
-
+                rc = conn.executemany(query, seq_of_params).rowcount
             except sqlite3.Error as e:
-                self.logger.error(f"DBManager: _execute_raw_query - SQLite error during execution: {query} - {e}", exc_info=True)
-                raise # Re-raise the SQLite error to be handled by calling code or context manager.
-            finally:
-                if cursor:
-                    cursor.close()
+                self._log_query_error(query_type, query, e)
+                raise # The context manager rolls the whole batch back.
+        self.logger.debug("DBManager: %s - executemany done. Rowcount: %s", query_type, rc)
+        return rc
+
+    # Each public method below has its own short code path (borrow a connection, execute,
+    # read exactly the result it returns) instead of going through one dispatcher that
+    # compared a query-type string on every call. Reads borrow from the read-only pool.
+    # `conn.execute()` creates the cursor implicitly; it is released with its last reference.
 
     def execute_query(self, query, params=None):
         """
@@ -221,38 +409,138 @@ class DatabaseManager:
             int: The number of rows affected if applicable (e.g., for some DML), or often -1 for DDL.
                  Behavior depends on the specific SQL command and SQLite driver.
         """
-        return self._execute_raw_query("execute_query", query, params)
+        with get_database_connection() as conn:
+            try:
+                rc = conn.execute(query, params or ()).rowcount
+            except sqlite3.Error as e:
+                self._log_query_error("execute_query", query, e)
+                raise
+        self.logger.debug("DBManager: execute_query - rowcount: %s", rc)
+        return rc
 
-    def fetchone(self, query, params=None):
+    def execute_once(self, sql):
+        """
+        Executes one-off SQL without parameters (DDL such as CREATE TABLE/INDEX/TRIGGER,
+        ALTER TABLE, or a one-time backfill), e.g. during schema initialization.
+
+        Unlike `execute_query`, the statement does not go through the connection's
+        prepared-statement cache: `executescript` prepares, runs and finalizes it, so
+        statements that run once per process do not take cache slots (and memory) from the
+        queries that are repeated on every request.
+
+        Args:
+            sql (str): The SQL to execute. May contain several `;`-separated statements.
+        """
+        with get_database_connection() as conn:
+            try:
+                conn.executescript(sql)
+            except sqlite3.Error as e:
+                self._log_query_error("execute_once", sql, e)
+                raise
+        self.logger.debug("DBManager: execute_once - done.")
+
+    def _select(self, conn, query, params, row_factory):
+        """Executes a SELECT on `conn` and returns the cursor, with `row_factory` set on the cursor only."""
+        if row_factory is sqlite3.Row: # The pooled connections' default; no cursor setup needed.
+            return conn.execute(query, params or ())
+        # Set on this cursor, not the connection, so the pooled connection keeps returning
+        # sqlite3.Row for everyone else and there is nothing to restore.
+        cursor = conn.cursor()
+        cursor.row_factory = row_factory
+        return cursor.execute(query, params or ())
+
+    def fetchone(self, query, params=None, row_factory=sqlite3.Row):
         """
         Executes a SELECT query and fetches the first row as a dictionary-like object.
 
         Args:
             query (str): The SQL SELECT query string.
             params (tuple, optional): Parameters to substitute into the query. Defaults to None.
+            row_factory (callable, optional): Row factory for this query. Defaults to `sqlite3.Row`;
+                pass None for a plain tuple.
 
         Returns:
             sqlite3.Row or None: The first row if found, otherwise None.
         """
-        row = self._execute_raw_query("fetchone", query, params)
-        self.logger.debug(f"DBManager: fetchone - result: {'Row returned' if row else 'No row returned'}")
+        with get_database_connection(readonly=True) as conn:
+            try:
+                row = self._select(conn, query, params, row_factory).fetchone()
+            except sqlite3.Error as e:
+                self._log_query_error("fetchone", query, e)
+                raise
+        self.logger.debug("DBManager: fetchone - result: %s", 'Row returned' if row else 'No row returned')
         return row
 
-    def fetchall(self, query, params=None):
+    def fetchall(self, query, params=None, row_factory=sqlite3.Row):
         """
         Executes a SELECT query and fetches all rows as a list of dictionary-like objects.
 
         Args:
             query (str): The SQL SELECT query string.
             params (tuple, optional): Parameters to substitute into the query. Defaults to None.
+            row_factory (callable, optional): Row factory for this query. Defaults to `sqlite3.Row`;
+                pass None for plain tuples (see `fetchall_tuples`).
 
         Returns:
             list: A list of sqlite3.Row objects. Returns an empty list if no rows are found.
         """
-        rows = self._execute_raw_query("fetchall", query, params)
-        self.logger.debug(f"DBManager: fetchall - result: {len(rows)} rows returned.")
+        with get_database_connection(readonly=True) as conn:
+            try:
+                rows = self._select(conn, query, params, row_factory).fetchall()
+            except sqlite3.Error as e:
+                self._log_query_error("fetchall", query, e)
+                raise
+        self.logger.debug("DBManager: fetchall - result: %s rows returned.", len(rows))
         return rows
 
+    def fetchall_tuples(self, query, params=None):
+        """
+        Like `fetchall`, but returns plain tuples. Use it when the caller reads columns by
+        position only (e.g., a list of IDs): tuples skip the per-row `sqlite3.Row` wrapper.
+
+        Returns:
+            list: A list of tuples. Returns an empty list if no rows are found.
+        """
+        return self.fetchall(query, params, row_factory=None)
+
+    def iter_rows(self, query, params=None, arraysize=1000, row_factory=sqlite3.Row):
+        """
+        Executes a SELECT query and yields its rows one at a time, fetching them from SQLite
+        `arraysize` rows at a time, so large result sets (e.g., exports) are never held in
+        memory as a whole list.
+
+        The read-only connection is borrowed when iteration starts and returned when the
+        generator is exhausted or closed, so it must be iterated within the app context
+        (e.g., inside the request) and not kept around half-consumed.
+
+        Args:
+            query (str): The SQL SELECT query string.
+            params (tuple, optional): Parameters to substitute into the query. Defaults to None.
+            arraysize (int, optional): Rows fetched per batch. Defaults to 1000.
+            row_factory (callable, optional): Row factory for this query, as for `fetchall`.
+
+        Yields:
+            sqlite3.Row: Each row of the result (or whatever `row_factory` returns).
+        """
+        # Not wrapped in get_database_connection(): a read-only connection has nothing to
+        # commit, and abandoning the generator (GeneratorExit) is not an error to roll back.
+        db_path = _get_db_path_for_manager()
+        conn = _acquire_connection(db_path, self.logger, readonly=True)
+        cursor = None
+        try:
+            try:
+                cursor = self._select(conn, query, params, row_factory)
+                cursor.arraysize = arraysize
+                while batch := cursor.fetchmany():
+                    yield from batch
+            except sqlite3.Error as e:
+                self._log_query_error("iter_rows", query, e)
+                raise
+        finally:
+            if cursor is not None:
+                cursor.close() # Reset the statement before the connection goes back to the pool.
+            _release_connection(db_path, conn, self.logger, readonly=True)
+
     def insert(self, query, params=None):
         """
         Executes an INSERT SQL query.
@@ -265,8 +553,13 @@ class DatabaseManager:
             int or None: The ID of the last inserted row (if `lastrowid` is supported and applicable),
                          otherwise None or another value depending on the database/driver.
         """
-        last_id = self._execute_raw_query("insert", query, params)
-        self.logger.debug(f"DBManager: insert - lastrowid: {last_id}")
+        with get_database_connection() as conn:
+            try:
+                last_id = conn.execute(query, params or ()).lastrowid
+            except sqlite3.Error as e:
+                self._log_query_error("insert", query, e)
+                raise
+        self.logger.debug("DBManager: insert - lastrowid: %s", last_id)
         return last_id
 
     def update(self, query, params=None):
@@ -280,8 +573,13 @@ class DatabaseManager:
         Returns:
             int: The number of rows affected by the UPDATE operation.
         """
-        rc = self._execute_raw_query("update", query, params)
-        self.logger.debug(f"DBManager: update - rowcount: {rc}")
+        with get_database_connection() as conn:
+            try:
+                rc = conn.execute(query, params or ()).rowcount
+            except sqlite3.Error as e:
+                self._log_query_error("update", query, e)
+                raise
+        self.logger.debug("DBManager: update - rowcount: %s", rc)
         return rc
 
     def delete(self, query, params=None):
@@ -295,18 +593,53 @@ class DatabaseManager:
         Returns:
             int: The number of rows affected by the DELETE operation.
         """
-        rc = self._execute_raw_query("delete", query, params)
-        self.logger.debug(f"DBManager: delete - rowcount: {rc}")
+        with get_database_connection() as conn:
+            try:
+                rc = conn.execute(query, params or ()).rowcount
+            except sqlite3.Error as e:
+                self._log_query_error("delete", query, e)
+                raise
+        self.logger.debug("DBManager: delete - rowcount: %s", rc)
         return rc
 
-# Note on the example snippet previously at the end:
-# The lines:
-# # db_manager = None
-# # def init_db_manager(app):
-# #     global db_manager
-# #     db_manager = DatabaseManager()
-# appear to be an illustrative example of how one *might* initialize a global
-# db_manager instance if it weren't already instantiated at the module level
-# (as `db_manager = DatabaseManager()` is now done in `app/db.py` which imports this class,
-# or if this class itself was the primary provider of the global instance).
-# In the current project structure, `app.db.db_manager` is the global instance.
\ No newline at end of file
+    def insert_many(self, query, seq_of_params):
+        """
+        Executes an INSERT SQL query once for each parameter tuple, in a single transaction.
+
+        Use this instead of calling `insert()` in a loop: all rows share one connection and
+        one commit, and either all of them are inserted or (on error) none.
+
+        Args:
+            query (str): The SQL INSERT query string.
+            seq_of_params (iterable): One parameter tuple per row.
+
+        Returns:
+            int: The total number of rows inserted.
+        """
+        return self._execute_many("insert_many", query, seq_of_params)
+
+    def update_many(self, query, seq_of_params):
+        """
+        Executes an UPDATE SQL query once for each parameter tuple, in a single transaction.
+
+        Args:
+            query (str): The SQL UPDATE query string.
+            seq_of_params (iterable): One parameter tuple per execution.
+
+        Returns:
+            int: The total number of rows affected.
+        """
+        return self._execute_many("update_many", query, seq_of_params)
+
+    def delete_many(self, query, seq_of_params):
+        """
+        Executes a DELETE SQL query once for each parameter tuple, in a single transaction.
+
+        Args:
+            query (str): The SQL DELETE query string.
+            seq_of_params (iterable): One parameter tuple per execution.
+
+        Returns:
+            int: The total number of rows deleted.
+        """
+        return self._execute_many("delete_many", query, seq_of_params)
@@ -3,17 +3,19 @@ Database initialization, schema management, and utility functions.
 
 This module is responsible for:
 - Defining and initializing the database schema (tables, indexes).
-- Providing functions to ensure default settings, admin user, and default queue exist.
-- Loading application settings from the database.
+- Ensuring the default settings, admin user, and default queue exist (`bootstrap_db`).
+- Loading application settings from the database (cached; see `load_settings`).
 - Interacting with the database via a global `DatabaseManager` instance.
 """
 import os
+import time
+from functools import lru_cache
+from types import MappingProxyType
 from flask import current_app
-import sqlite3 # Keep for sqlite3.IntegrityError, a specific exception type.
-from werkzeug.security import generate_password_hash
+from utils.passwords import hash_password # Application-wide password KDF.
 from app.settings_loader import DEFAULT_SETTINGS # Predefined default application settings.
 import logging
-from app.database_manager import DatabaseManager
+from app.database_manager import DatabaseManager, get_database_connection
 
 # --- Global DatabaseManager Instance ---
 # A single instance of DatabaseManager is created when this module is loaded.
@@ -21,52 +23,104 @@ from app.database_manager import DatabaseManager
 # The DatabaseManager's constructor has a fallback for its logger if `current_app` is not yet available.
 db_manager = DatabaseManager()
 
-# --- Database Path ---
-def get_db_path():
-    """
-    Retrieves the configured database file path from the Flask application context.
+# --- Priority Ranking ---
+# Numeric rank stored alongside the textual priority so the ticket list can sort by
+# priority with a plain (indexable) integer column instead of a CASE expression per row.
+# Lower rank = more urgent. Kept in sync by the triggers created in init_db().
+PRIORITY_RANK_CASE_SQL = "CASE {col} WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 ELSE 4 END"
 
-    This function is crucial for the DatabaseManager to know where the SQLite database file is located.
-    It relies on `current_app.config['DATABASE']` being set.
+# --- Table Definitions ---
+# Tables that schema migrations may need to rebuild are defined once here, with the
+# table name as a placeholder, so the migration creates exactly the same definition.
+# Timestamps are stored as INTEGER Unix epoch seconds (UTC): comparisons are plain integer
+# compares in SQLite and nothing has to be parsed in Python. Format them for display with
+# the `datetimeformat` template filter or SQLite's strftime(..., 'unixepoch', 'localtime').
+TICKETS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,     -- Unique identifier for the ticket
+        title TEXT NOT NULL,                      -- Brief summary/title of the ticket
+        description TEXT,                         -- Detailed description of the issue/request
+        status TEXT NOT NULL DEFAULT 'open'       -- Current status (e.g., 'open', 'in progress', 'closed')
+            CHECK(status IN ('open', 'in progress', 'closed')),
+        priority TEXT NOT NULL DEFAULT 'medium'   -- Priority level (e.g., 'low', 'medium', 'high')
+            CHECK(priority IN ('low', 'medium', 'high')),
+        deadline INTEGER,                         -- Optional due date/time for the ticket (Unix epoch seconds)
+        created_at INTEGER NOT NULL,              -- Timestamp of when the ticket was created (Unix epoch seconds)
+        created_by INTEGER,                       -- User ID of the creator
+        queue_id INTEGER NOT NULL,                -- ID of the queue this ticket belongs to
+        assigned_to INTEGER,                      -- User ID of the person this ticket is assigned to
+        priority_rank INTEGER NOT NULL DEFAULT 2, -- Numeric priority (1=high, 2=medium, 3=low), maintained by triggers
+        updated_at REAL,                          -- Last change to the ticket or its comments (Unix epoch seconds, fractional), maintained by triggers
+        FOREIGN KEY (queue_id) REFERENCES queues(id) ON DELETE CASCADE, -- If a queue is deleted, its tickets are also deleted
+        FOREIGN KEY (assigned_to) REFERENCES users(id) ON DELETE SET NULL, -- If an assigned user is deleted, set assigned_to to NULL
+        FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL   -- If the creating user is deleted, set created_by to NULL
+    )
+"""
 
-    Raises:
-        RuntimeError: If called outside of an active Flask application context.
-    """
-    # This function might also be used by database_manager.py if it attempts to import it directly,
-    # though DatabaseManager now has its own internal way or requires it to be passed.
-    if not current_app:
-        # This situation should ideally be avoided by ensuring db_manager and its dependencies
-        # are used only when the app context is available or by passing config explicitly.
-        raise RuntimeError(
-            "Application context not available for get_db_path. "
-            "Ensure 'DATABASE' is configured in the Flask app."
-        )
-    return current_app.config['DATABASE']
+COMMENTS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, -- Unique identifier for the comment
+        ticket_id INTEGER NOT NULL,           -- ID of the ticket this comment belongs to
+        user_id INTEGER,                      -- User ID of the commenter
+        content TEXT NOT NULL,                -- The text content of the comment
+        created_at INTEGER NOT NULL,          -- Timestamp of when the comment was created (Unix epoch seconds)
+        FOREIGN KEY (ticket_id) REFERENCES tickets(id) ON DELETE CASCADE, -- If a ticket is deleted, its comments are also deleted
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL     -- If the commenting user is deleted, set user_id to NULL
+    )
+"""
 
+# Current time as fractional Unix epoch seconds (millisecond resolution), for tickets.updated_at.
+_NOW_EPOCH_REAL_SQL = "((julianday('now') - 2440587.5) * 86400.0)"
+
+# SQL expression converting a legacy ISO-8601 text timestamp (naive local time, as written by
+# datetime.now().isoformat()) to epoch seconds. Non-text values pass through unchanged.
+_ISO_TO_EPOCH_SQL = "CASE WHEN typeof({col}) = 'text' THEN CAST(strftime('%s', {col}, 'utc') AS INTEGER) ELSE {col} END"
 
 # --- Settings Management ---
+# Maximum age of the cached settings, in seconds. Settings are read on many requests (e.g.,
+# the registration check, every notification e-mail) but change only through the admin
+# settings page. That page calls `invalidate_settings()`; the time bucket bounds staleness in
+# the other worker processes, which cannot be invalidated directly.
+SETTINGS_CACHE_TTL_SECONDS = 30
+
+
+def _settings_ttl_bucket():
+    """Returns the current time bucket; a new bucket forces a reload."""
+    return int(time.monotonic() // SETTINGS_CACHE_TTL_SECONDS)
+
+
+@lru_cache(maxsize=1)
+def _settings_cached(_bucket):
+    # Exceptions propagate (and are therefore not cached); load_settings() handles them.
+    # Returned read-only so the shared cached value cannot be mutated by a caller.
+    return MappingProxyType({row['key']: row['value'] for row in db_manager.fetchall('SELECT key, value FROM settings')})
+
+
 def load_settings():
     """
     Loads all application settings from the 'settings' table in the database.
 
+    The table is read at most once per `SETTINGS_CACHE_TTL_SECONDS` per process;
+    call `invalidate_settings()` after changing a setting.
+
     Returns:
         dict: A dictionary where keys are setting names and values are their corresponding values.
               Returns an empty dictionary if loading fails or no settings are found.
+              The dict is a fresh copy, so callers may modify it.
     """
-    # Use current_app.logger if available, otherwise a default logger for this module.
-    logger = current_app.logger if current_app else logging.getLogger(__name__)
-    logger.debug("Attempting to load settings from database via DatabaseManager.")
     try:
-        # Fetch all rows from the 'settings' table.
-        rows = db_manager.fetchall('SELECT key, value FROM settings')
-        # Convert list of rows (dictionaries) into a single settings dictionary.
-        settings_data = {row['key']: row['value'] for row in rows}
-        logger.debug(f"Successfully loaded {len(settings_data)} settings from the database.")
-        return settings_data
+        return dict(_settings_cached(_settings_ttl_bucket()))
     except Exception as e:
+        # Use current_app.logger if available, otherwise a default logger for this module.
+        logger = current_app.logger if current_app else logging.getLogger(__name__)
         logger.error(f"Failed to load settings from database: {e}", exc_info=True)
         return {} # Return empty dict on error to prevent crashes, allowing defaults to be used.
 
+
+def invalidate_settings():
+    """Drops the cached settings. Call after updating the 'settings' table."""
+    _settings_cached.cache_clear()
+
 # --- Database Initialization and Schema ---
 def init_db():
     """
@@ -75,7 +129,8 @@ def init_db():
     This function defines the entire database schema. It's designed to be idempotent,
     meaning it can be run multiple times without causing errors or unintended changes
     if the schema already exists.
-    Uses `db_manager.execute_query` which handles transactions implicitly.
+    Uses `db_manager.execute_once`, which runs each one-off DDL statement without adding it to
+    the pooled connection's prepared-statement cache.
     """
     logger = current_app.logger if current_app else logging.getLogger(__name__)
     logger.info("Initializing database schema via DatabaseManager...")
@@ -83,8 +138,15 @@ def init_db():
         # The DatabaseManager's get_database_connection method uses a context manager
         # that handles commits for DDL statements automatically if successful, or rolls back on error.
 
+        # An empty sqlite_master means the database file is new (SQLite creates it on first connect),
+        # so the statements below create the schema rather than just verifying it.
+        # A read-write connection is used on purpose: db_manager.fetchone() borrows a read-only
+        # connection, which cannot open (or create) a database file that does not exist yet.
+        with get_database_connection() as conn:
+            is_new_database = conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone() is None
+
         logger.debug("Creating/verifying table: queues (for ticket categorization)")
-        db_manager.execute_query("""
+        db_manager.execute_once("""
             CREATE TABLE IF NOT EXISTS queues (
                 id INTEGER PRIMARY KEY AUTOINCREMENT, -- Unique identifier for the queue
                 name TEXT NOT NULL UNIQUE             -- Name of the queue (e.g., "Support", "Development")
@@ -92,28 +154,20 @@ def init_db():
         """)
 
         logger.debug("Creating/verifying table: tickets (core ticket information)")
-        db_manager.execute_query("""
-            CREATE TABLE IF NOT EXISTS tickets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,     -- Unique identifier for the ticket
-                title TEXT NOT NULL,                      -- Brief summary/title of the ticket
-                description TEXT,                         -- Detailed description of the issue/request
-                status TEXT NOT NULL DEFAULT 'open'       -- Current status (e.g., 'open', 'in progress', 'closed')
-                    CHECK(status IN ('open', 'in progress', 'closed')),
-                priority TEXT NOT NULL DEFAULT 'medium'   -- Priority level (e.g., 'low', 'medium', 'high')
-                    CHECK(priority IN ('low', 'medium', 'high')),
-                deadline TEXT,                            -- Optional due date/time for the ticket (ISO format string)
-                created_at TEXT NOT NULL,                 -- Timestamp of when the ticket was created (ISO format string)
-                created_by INTEGER,                       -- User ID of the creator
-                queue_id INTEGER NOT NULL,                -- ID of the queue this ticket belongs to
-                assigned_to INTEGER,                      -- User ID of the person this ticket is assigned to
-                FOREIGN KEY (queue_id) REFERENCES queues(id) ON DELETE CASCADE, -- If a queue is deleted, its tickets are also deleted
-                FOREIGN KEY (assigned_to) REFERENCES users(id) ON DELETE SET NULL, -- If an assigned user is deleted, set assigned_to to NULL
-                FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL   -- If the creating user is deleted, set created_by to NULL
-            )
-        """)
+        db_manager.execute_once(TICKETS_TABLE_SQL.format(table='tickets'))
+
+        # Databases created before priority_rank existed get the column added and backfilled.
+        if _ensure_column('tickets', 'priority_rank', 'INTEGER NOT NULL DEFAULT 2',
+                          backfill_sql=f"UPDATE tickets SET priority_rank = {PRIORITY_RANK_CASE_SQL.format(col='priority')}"):
+            logger.info("Added and backfilled tickets.priority_rank column.")
+        # Databases created before updated_at existed get the column. Only those pre-existing rows
+        # keep NULL (until their next change): on a new ticket the priority_rank insert trigger's
+        # UPDATE fires trg_tickets_updated_at, so updated_at is set at creation time.
+        if _ensure_column('tickets', 'updated_at', 'REAL'):
+            logger.info("Added tickets.updated_at column.")
 
         logger.debug("Creating/verifying table: users (application users and their details)")
-        db_manager.execute_query("""
+        db_manager.execute_once("""
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT, -- Unique identifier for the user
                 username TEXT NOT NULL UNIQUE,        -- Unique username for login
@@ -131,20 +185,10 @@ def init_db():
         """)
 
         logger.debug("Creating/verifying table: comments (for discussions on tickets)")
-        db_manager.execute_query("""
-            CREATE TABLE IF NOT EXISTS comments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT, -- Unique identifier for the comment
-                ticket_id INTEGER NOT NULL,           -- ID of the ticket this comment belongs to
-                user_id INTEGER,                      -- User ID of the commenter
-                content TEXT NOT NULL,                -- The text content of the comment
-                created_at TEXT NOT NULL,             -- Timestamp of when the comment was created (ISO format string)
-                FOREIGN KEY (ticket_id) REFERENCES tickets(id) ON DELETE CASCADE, -- If a ticket is deleted, its comments are also deleted
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL     -- If the commenting user is deleted, set user_id to NULL
-            )
-        """)
+        db_manager.execute_once(COMMENTS_TABLE_SQL.format(table='comments'))
 
         logger.debug("Creating/verifying table: attachments (for files attached to tickets)")
-        db_manager.execute_query("""
+        db_manager.execute_once("""
             CREATE TABLE IF NOT EXISTS attachments (
                 id INTEGER PRIMARY KEY AUTOINCREMENT, -- Unique identifier for the attachment
                 ticket_id INTEGER NOT NULL,           -- ID of the ticket this attachment belongs to
@@ -159,95 +203,276 @@ def init_db():
         """)
 
         logger.debug("Creating/verifying table: settings (for application-wide configuration)")
-        db_manager.execute_query("""
+        db_manager.execute_once("""
             CREATE TABLE IF NOT EXISTS settings (
                 key TEXT PRIMARY KEY, -- Unique key for the setting (e.g., 'site_name')
                 value TEXT NOT NULL   -- Value of the setting
             )
         """)
 
+        # Databases created before timestamps were stored as epoch integers are converted in place.
+        _migrate_timestamps_to_epoch(logger)
+
+        logger.debug("Creating/verifying triggers keeping tickets.priority_rank in sync with tickets.priority")
+        # Triggers cover every writer (web forms, API, webhook) without each having to know about the rank.
+        db_manager.execute_once(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_tickets_priority_rank_insert AFTER INSERT ON tickets
+            BEGIN
+                UPDATE tickets SET priority_rank = {PRIORITY_RANK_CASE_SQL.format(col='NEW.priority')} WHERE id = NEW.id;
+            END
+        """)
+        db_manager.execute_once(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_tickets_priority_rank_update AFTER UPDATE OF priority ON tickets
+            BEGIN
+                UPDATE tickets SET priority_rank = {PRIORITY_RANK_CASE_SQL.format(col='NEW.priority')} WHERE id = NEW.id;
+            END
+        """)
+
+        logger.debug("Creating/verifying triggers maintaining tickets.updated_at")
+        # Any change to a ticket (unless the writer sets updated_at itself) and any new comment
+        # bumps updated_at, which the API uses as the ticket detail's ETag / Last-Modified.
+        db_manager.execute_once(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_tickets_updated_at AFTER UPDATE ON tickets
+            WHEN NEW.updated_at IS OLD.updated_at
+            BEGIN
+                UPDATE tickets SET updated_at = {_NOW_EPOCH_REAL_SQL} WHERE id = NEW.id;
+            END
+        """)
+        db_manager.execute_once(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_comments_touch_ticket AFTER INSERT ON comments
+            BEGIN
+                UPDATE tickets SET updated_at = {_NOW_EPOCH_REAL_SQL} WHERE id = NEW.ticket_id;
+            END
+        """)
+
+        logger.debug("Creating/verifying table and triggers: ticket_stats (ticket counts per status)")
+        # Materialized per-status ticket counts, kept current by triggers on every write path
+        # (including ON DELETE CASCADE from queues), so list pages can read totals with a
+        # primary-key lookup instead of scanning `tickets`.
+        db_manager.execute_once("""
+            CREATE TABLE IF NOT EXISTS ticket_stats (
+                status TEXT PRIMARY KEY,         -- Ticket status (same values as tickets.status)
+                cnt INTEGER NOT NULL DEFAULT 0   -- Number of tickets currently in this status
+            )
+        """)
+        db_manager.execute_once("""
+            CREATE TRIGGER IF NOT EXISTS trg_ticket_stats_insert AFTER INSERT ON tickets
+            BEGIN
+                INSERT INTO ticket_stats (status, cnt) VALUES (NEW.status, 1)
+                    ON CONFLICT(status) DO UPDATE SET cnt = cnt + 1;
+            END
+        """)
+        db_manager.execute_once("""
+            CREATE TRIGGER IF NOT EXISTS trg_ticket_stats_delete AFTER DELETE ON tickets
+            BEGIN
+                UPDATE ticket_stats SET cnt = cnt - 1 WHERE status = OLD.status;
+            END
+        """)
+        db_manager.execute_once("""
+            CREATE TRIGGER IF NOT EXISTS trg_ticket_stats_update AFTER UPDATE OF status ON tickets
+            WHEN OLD.status IS NOT NEW.status
+            BEGIN
+                UPDATE ticket_stats SET cnt = cnt - 1 WHERE status = OLD.status;
+                INSERT INTO ticket_stats (status, cnt) VALUES (NEW.status, 1)
+                    ON CONFLICT(status) DO UPDATE SET cnt = cnt + 1;
+            END
+        """)
+        # (Re)seed the counts from the table itself. This covers upgrades from databases without
+        # ticket_stats as well as any drift, and runs atomically in one transaction.
+        with get_database_connection() as conn:
+            conn.execute("DELETE FROM ticket_stats")
+            conn.execute("INSERT INTO ticket_stats (status, cnt) SELECT status, COUNT(*) FROM tickets GROUP BY status")
+
         logger.debug("Creating/verifying indexes for performance optimization...")
         # Indexes on foreign keys and frequently queried columns can significantly improve query performance.
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_tickets_queue_id ON tickets (queue_id)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_tickets_assigned_to ON tickets (assigned_to)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_tickets_created_by ON tickets (created_by)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets (status)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets (priority)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_comments_ticket_id ON comments (ticket_id)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_comments_user_id ON comments (user_id)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_attachments_ticket_id ON attachments (ticket_id)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_attachments_user_id ON attachments (user_id)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_tickets_queue_id ON tickets (queue_id)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_tickets_assigned_to ON tickets (assigned_to)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_tickets_created_by ON tickets (created_by)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets (status)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets (priority)")
+        # Serves the priority-sorted ticket list (ORDER BY priority_rank, created_at DESC) straight from the index.
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_tickets_priority_rank ON tickets (priority_rank, created_at DESC)")
+        # API ticket list: newest first with `id` as tiebreaker, serving both OFFSET and keyset
+        # ((created_at, id) < (?, ?)) pagination in index order.
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_tickets_created_id ON tickets (created_at DESC, id DESC)")
+        # "Assigned to me" API list of open tickets: partial index holding only non-closed tickets,
+        # used when the query has the literal `status != 'closed'` condition.
+        db_manager.execute_once(
+            "CREATE INDEX IF NOT EXISTS idx_tickets_assignee_open_created "
+            "ON tickets (assigned_to, created_at DESC, id DESC) WHERE status != 'closed'"
+        )
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_comments_ticket_id ON comments (ticket_id)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_comments_user_id ON comments (user_id)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_attachments_ticket_id ON attachments (ticket_id)")
+        db_manager.execute_once("CREATE INDEX IF NOT EXISTS idx_attachments_user_id ON attachments (user_id)")
         logger.debug("Database indexes created/verified successfully.")
 
+        if is_new_database:
+            logger.info(f"Created database schema in new database at {current_app.config.get('DATABASE')}.")
         logger.info("Database schema initialization process complete.")
     except Exception as e:
         logger.critical(f"CRITICAL FAILURE: Database schema initialization failed: {e}", exc_info=True)
         raise # Re-raise the exception to halt application startup if schema init fails.
 
-def ensure_default_settings():
+def _migrate_timestamps_to_epoch(logger):
+    """
+    Converts `tickets` and `comments` from ISO text timestamps to INTEGER epoch seconds.
+
+    Databases created by older versions declare these columns as TEXT. Because of SQLite's
+    column affinity, integers written to a TEXT column are stored as text again, so an
+    in-place UPDATE is not enough: each table is rebuilt with the current definition
+    (create new table, copy converted rows, drop old, rename), following SQLite's documented
+    procedure for schema changes. Foreign key enforcement is switched off for the rebuild so
+    dropping `tickets` does not cascade into comments/attachments. Indexes and triggers
+    dropped with the old tables are recreated by the remainder of init_db().
+
+    All gunicorn workers run this at startup at the same time. The read-only pre-check only
+    skips the write lock on databases that are already migrated; the decision to rebuild is
+    made again inside the `BEGIN IMMEDIATE` transaction that performs it, so a worker that
+    waited for the lock sees the rebuilt table and leaves it (and the triggers and indexes
+    another worker may already have recreated) alone.
+
+    Args:
+        logger: Logger used to report the migration.
     """
-    Ensures that all default application settings (defined in `DEFAULT_SETTINGS`)
-    are present in the 'settings' table. If a setting is missing, it's inserted
-    with its default value.
+    def needs_migration(table, conn=None):
+        sql, params = "SELECT type FROM pragma_table_info(?) WHERE name = 'created_at'", (table,)
+        row = conn.execute(sql, params).fetchone() if conn is not None else db_manager.fetchone(sql, params)
+        return row is not None and row['type'].upper() == 'TEXT'
+
+    tickets_columns = "id, title, description, status, priority, deadline, created_at, created_by, queue_id, assigned_to, priority_rank"
+    comments_columns = "id, ticket_id, user_id, content, created_at"
+    now_epoch = "CAST(strftime('%s', 'now') AS INTEGER)" # Fallback for unparseable legacy values.
+    rebuilds = {
+        'tickets': (TICKETS_TABLE_SQL, tickets_columns,
+                    f"""id, title, description, status, priority,
+                        {_ISO_TO_EPOCH_SQL.format(col='deadline')},
+                        COALESCE({_ISO_TO_EPOCH_SQL.format(col='created_at')}, {now_epoch}),
+                        created_by, queue_id, assigned_to, priority_rank"""),
+        'comments': (COMMENTS_TABLE_SQL, comments_columns,
+                     f"""id, ticket_id, user_id, content,
+                         COALESCE({_ISO_TO_EPOCH_SQL.format(col='created_at')}, {now_epoch})"""),
+    }
+
+    for table, (table_sql, columns, select_sql) in rebuilds.items():
+        if not needs_migration(table):
+            continue
+        migrated = False
+        with get_database_connection() as conn:
+            conn.execute("PRAGMA foreign_keys = OFF") # Must be set outside a transaction.
+            try:
+                # Statements run one by one (executescript would commit the open transaction).
+                conn.execute("BEGIN IMMEDIATE") # Waits (busy timeout) for a worker already rebuilding.
+                if needs_migration(table, conn): # Re-checked under the write lock.
+                    logger.info(f"Migrating '{table}' timestamps from ISO text to INTEGER epoch seconds...")
+                    conn.execute(f"DROP TABLE IF EXISTS {table}_migration")
+                    conn.execute(table_sql.format(table=f'{table}_migration'))
+                    conn.execute(f"INSERT INTO {table}_migration ({columns}) SELECT {select_sql} FROM {table}")
+                    conn.execute(f"DROP TABLE {table}")
+                    conn.execute(f"ALTER TABLE {table}_migration RENAME TO {table}")
+                    migrated = True
+                conn.commit()
+            except Exception:
+                conn.rollback() # End the failed transaction so the PRAGMA below takes effect.
+                raise
+            finally:
+                conn.execute("PRAGMA foreign_keys = ON") # Always restore before the pooled connection is reused.
+        if migrated:
+            logger.info(f"Migrated '{table}' timestamps to INTEGER epoch seconds.")
+
+def _ensure_column(table, column, definition, backfill_sql=None):
     """
-    logger = current_app.logger if current_app else logging.getLogger(__name__)
-    logger.info("Ensuring default application settings are present in the database...")
-    settings_added_count = 0
-    try:
-        for key, info in DEFAULT_SETTINGS.items():
-            # Check if the setting key already exists in the database.
-            exists = db_manager.fetchone("SELECT 1 FROM settings WHERE key = ?", (key,))
-            if not exists:
-                default_value = info.get('default', '') # Get default value from DEFAULT_SETTINGS structure.
-                try:
-                    # Insert the missing setting with its default value.
-                    db_manager.insert("INSERT INTO settings (key, value) VALUES (?, ?)", (key, default_value))
-                    logger.info(f"Inserted default setting: '{key}' = '{default_value}'")
-                    settings_added_count += 1
-                except sqlite3.IntegrityError:
-                    # This handles a rare race condition if another process inserted it meanwhile.
-                    logger.warning(f"Default setting for key '{key}' already exists (caught by IntegrityError during insert). Skipping.")
-                except Exception as e_insert:
-                    logger.error(f"Error inserting default setting for key '{key}': {e_insert}", exc_info=True)
-                    # Depending on severity, one might choose to re-raise here.
-        
-        if settings_added_count > 0:
-            logger.info(f"Finished ensuring default settings. Added {settings_added_count} new settings.")
-        else:
-            logger.info("Finished ensuring default settings. All defaults were already present or skipped.")
-    except Exception as e: # Catch errors from the initial db_manager.fetchone or other unexpected issues.
-        logger.error(f"An error occurred during the ensure_default_settings process (outer try-except): {e}", exc_info=True)
+    Adds a column to an existing table if it is not present yet.
+
+    `CREATE TABLE IF NOT EXISTS` does not alter tables created by older versions
+    of the schema, so new columns are added here for existing databases.
 
+    Every gunicorn worker runs init_db() at startup, concurrently. The check, the
+    ALTER TABLE and the optional backfill therefore run in one `BEGIN IMMEDIATE`
+    transaction: the first worker to take the write lock adds the column, and the
+    others, which re-read the columns only once they hold the lock, find it present.
 
-def ensure_admin_user():
+    Args:
+        table (str): Table name (trusted, not user input).
+        column (str): Column name to check for/add.
+        definition (str): Column type and constraints used in ALTER TABLE ... ADD COLUMN.
+        backfill_sql (str, optional): Statement filling the new column, run in the same
+            transaction (so no other worker sees the column before it is filled).
+
+    Returns:
+        bool: True if the column was added, False if it already existed.
+    """
+    with get_database_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE") # Write lock first, then look at the schema.
+        existing_columns = {row['name'] for row in conn.execute("SELECT name FROM pragma_table_info(?)", (table,))}
+        if column in existing_columns:
+            return False # Leaving the block commits the (empty) transaction.
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        if backfill_sql:
+            conn.execute(backfill_sql)
+    return True
+
+# Name of the queue that tickets fall back to when none is selected.
+DEFAULT_QUEUE_NAME = "Unassigned"
+
+def bootstrap_db():
     """
-    Ensures that a default administrator user exists in the 'users' table.
-    If not, it creates one using credentials from application settings
-    ('admin_username', 'admin_password') or falls back to 'admin'/'changeme'.
+    Ensures the default data exists and loads the application settings, all on
+    a single database connection and in a single transaction.
+
+    This covers what application startup needs after `init_db()`:
+    - Every default setting from `DEFAULT_SETTINGS` is present in 'settings'
+      (`INSERT OR IGNORE`; existing values are never overwritten).
+    - The default ticket queue (`DEFAULT_QUEUE_NAME`) exists.
+    - A default administrator exists, created from the 'admin_username' /
+      'admin_password' settings (falling back to 'admin'/'changeme').
+
+    The existing settings and admin user are read before any write, so the
+    (deliberately slow) password hash for a new admin is computed without
+    holding SQLite's write lock. `INSERT OR IGNORE` also covers another worker
+    process creating the same rows concurrently.
+
+    Returns:
+        tuple: (settings, default_queue_id) where `settings` is a dict of all
+               settings (as `load_settings()` would return after the defaults were
+               written) and `default_queue_id` is the ID of the default queue.
+               Returns ({}, None) if bootstrapping fails.
     """
     logger = current_app.logger if current_app else logging.getLogger(__name__)
-    logger.info("Ensuring default admin user exists...")
+    logger.info("Ensuring default settings, queue and admin user exist...")
+    default_rows = [(key, info.get('default', '')) for key, info in DEFAULT_SETTINGS.items()]
     try:
-        current_settings = load_settings() # Load settings to get admin credentials.
-        # Use configured admin username/password, or fallback to defaults.
-        username = current_settings.get('admin_username', 'admin')
-        password = current_settings.get('admin_password', 'changeme') # Default password, highly insecure.
-
-        # Check if the admin user already exists.
-        existing_admin = db_manager.fetchone("SELECT id FROM users WHERE username = ?", (username,))
-        
-        if existing_admin:
-            logger.info(f"Admin user '{username}' (ID: {existing_admin['id']}) already exists. No action needed.")
-            return
-
-        # If admin user does not exist, create one.
-        logger.info(f"Admin user '{username}' not found. Attempting to create...")
-        hashed_password = generate_password_hash(password) # Always hash passwords before storing.
-        try:
-            new_admin_id = db_manager.insert(
-                "INSERT INTO users (username, password, is_admin, email, theme) VALUES (?, ?, 1, ?, ?)", # is_admin set to 1
-                (username, hashed_password, f"{username}@example.com", "dark") # Added default email and theme
-            )
+        with get_database_connection() as conn:
+            # Reads first: stored values override the defaults that are about to be inserted.
+            settings = dict(default_rows)
+            settings.update((row['key'], row['value']) for row in conn.execute('SELECT key, value FROM settings'))
+            username = settings.get('admin_username', 'admin')
+            password = settings.get('admin_password', 'changeme') # Default password, highly insecure.
+            admin_exists = conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+            # Always hash passwords before storing.
+            hashed_password = None if admin_exists else hash_password(password)
+
+            changes_before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)", default_rows)
+            settings_added_count = conn.total_changes - changes_before
+
+            conn.execute("INSERT OR IGNORE INTO queues (name) VALUES (?)", (DEFAULT_QUEUE_NAME,))
+            default_queue_id = conn.execute(
+                "SELECT id FROM queues WHERE name = ?", (DEFAULT_QUEUE_NAME,)
+            ).fetchone()['id']
+
+            new_admin_id = None
+            if hashed_password is not None:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO users (username, password, is_admin, email, theme) VALUES (?, ?, 1, ?, ?)", # is_admin set to 1
+                    (username, hashed_password, f"{username}@example.com", "dark") # Default email and theme
+                )
+                new_admin_id = cursor.lastrowid if cursor.rowcount else None
+
+        if settings_added_count > 0:
+            logger.info(f"Added {settings_added_count} missing default settings.")
+        logger.info(f"Default queue '{DEFAULT_QUEUE_NAME}' has ID {default_queue_id}.")
+        if new_admin_id is not None:
             logger.info(f"Admin user '{username}' (ID: {new_admin_id}) created successfully.")
             if password == 'changeme':
                 # Log a critical warning if the default insecure password was used.
@@ -256,65 +481,7 @@ def ensure_admin_user():
                     f"was created with the default password 'changeme'. "
                     f"THIS PASSWORD MUST BE CHANGED IMMEDIATELY through the application settings or user profile."
                 )
-        
-        except sqlite3.IntegrityError as ie:
-            # Handles race condition: if user was created between check and insert.
-            logger.warning(
-                f"INSERT attempt for admin user '{username}' failed with IntegrityError: {ie}. "
-                f"This usually means the user was created concurrently. Assuming user now exists."
-            )
-            # The transaction in db_manager.insert would have been rolled back by DatabaseManager.
-
+        return settings, default_queue_id
     except Exception as e:
-        logger.error(f"An unexpected error occurred while ensuring admin user: {e}", exc_info=True)
-
-def ensure_default_queue():
-    """
-    Ensures that a default ticket queue (named "Unassigned") exists in the 'queues' table.
-    If not, it creates one.
-
-    Returns:
-        int or None: The ID of the default queue if it exists or was created successfully,
-                     otherwise None if an error occurred.
-    """
-    logger = current_app.logger if current_app else logging.getLogger(__name__)
-    default_queue_name = "Unassigned"
-    logger.info(f"Ensuring default ticket queue '{default_queue_name}' exists...")
-    try:
-        # Check if the default queue already exists.
-        existing_queue = db_manager.fetchone("SELECT id FROM queues WHERE name = ?", (default_queue_name,))
-
-        if existing_queue:
-            logger.info(f"Default queue '{default_queue_name}' (ID: {existing_queue['id']}) already exists.")
-            return existing_queue['id']
-        else:
-            # If default queue does not exist, create it.
-            logger.info(f"Default queue '{default_queue_name}' not found. Attempting to create...")
-            try:
-                new_queue_id = db_manager.insert("INSERT INTO queues (name) VALUES (?)", (default_queue_name,))
-                logger.info(f"Default queue '{default_queue_name}' (ID: {new_queue_id}) created successfully.")
-                return new_queue_id
-            except sqlite3.IntegrityError:
-                # Handles race condition or if initial fetchone missed it.
-                logger.warning(
-                    f"IntegrityError when inserting default queue '{default_queue_name}'. "
-                    f"It likely already exists or was created concurrently. Re-fetching to confirm."
-                )
-                refetched_queue = db_manager.fetchone("SELECT id FROM queues WHERE name = ?", (default_queue_name,))
-                if refetched_queue:
-                    logger.info(f"Default queue '{default_queue_name}' (ID: {refetched_queue['id']}) confirmed to exist after IntegrityError.")
-                    return refetched_queue['id']
-                else:
-                    # This is an unexpected and problematic state.
-                    logger.error(
-                        f"CRITICAL: Default queue '{default_queue_name}' insert failed with IntegrityError, "
-                        f"but the queue still not found on re-fetch. Manual intervention may be required."
-                    )
-                    return None # Indicate failure.
-            except Exception as e_insert:
-                logger.error(f"Error inserting default queue '{default_queue_name}': {e_insert}", exc_info=True)
-                return None # Indicate failure.
-
-    except Exception as e: # Catch errors from the initial db_manager.fetchone.
-        logger.error(f"An error occurred during the ensure_default_queue process for '{default_queue_name}' (outer try-except): {e}", exc_info=True)
-        return None # Indicate failure.
+        logger.error(f"An error occurred while bootstrapping default database data: {e}", exc_info=True)
+        return {}, None
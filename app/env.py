@@ -0,0 +1,76 @@
+"""
+Process environment, parsed once.
+
+Every environment variable the application reads is listed and parsed here, in
+`Env.from_environ()`, instead of `os.environ.get()` calls scattered across the
+config, the app factory and the API module. The rest of the code reads
+attributes of the module-level `ENV` instance, so there is one place to audit
+which variables exist, their defaults and how they are interpreted.
+
+`ENV` is built when this module is first imported; changing the environment
+afterwards has no effect on a running process.
+"""
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Env:
+    """
+    Parsed environment variables. Unset optional variables are None.
+
+    Attributes:
+        flask_env (str): FLASK_ENV ('' if unset); 'production' enables production checks.
+        secret_key (str or None): SECRET_KEY, the Flask session/CSRF signing key.
+        jwt_secret_key (str or None): JWT_SECRET_KEY, the key for signing API tokens.
+        jwt_token_expire_hours (int): JWT_TOKEN_EXPIRE_HOURS (default 1), token lifetime in Config.
+        jwt_expiration_hours (int): JWT_EXPIRATION_HOURS (default 1), token lifetime set by the API module.
+        webhook_secret (str): WEBHOOK_SECRET ('' if unset), the shared secret for the webhook endpoint.
+        session_cookie_secure (bool): SESSION_COOKIE_SECURE ('true'/'false', case-insensitive).
+            Unset: True only when FLASK_ENV=production, so plain-HTTP setups keep working.
+        data_dir (str or None): DATA_DIR, the directory for uploads and the instance folder.
+        profile (bool): True if FLASK_PROFILE is '1' (see `app._install_profiler`).
+        profile_dir (str or None): FLASK_PROFILE_DIR, where request profiles are written.
+    """
+    flask_env: str
+    secret_key: str | None
+    jwt_secret_key: str | None
+    jwt_token_expire_hours: int
+    jwt_expiration_hours: int
+    webhook_secret: str
+    session_cookie_secure: bool
+    data_dir: str | None
+    profile: bool
+    profile_dir: str | None
+
+    @classmethod
+    def from_environ(cls, environ=None):
+        """
+        Builds an `Env` from `environ` (default: `os.environ`), reading each variable once.
+        """
+        if environ is None:
+            environ = os.environ
+        flask_env = environ.get('FLASK_ENV', '')
+        session_cookie_secure = environ.get('SESSION_COOKIE_SECURE')
+        return cls(
+            flask_env=flask_env,
+            secret_key=environ.get('SECRET_KEY'),
+            jwt_secret_key=environ.get('JWT_SECRET_KEY'),
+            jwt_token_expire_hours=int(environ.get('JWT_TOKEN_EXPIRE_HOURS', '1')),
+            jwt_expiration_hours=int(environ.get('JWT_EXPIRATION_HOURS', '1')),
+            webhook_secret=environ.get('WEBHOOK_SECRET', ''),
+            session_cookie_secure=(flask_env == 'production' if session_cookie_secure is None
+                                   else session_cookie_secure.lower() == 'true'),
+            data_dir=environ.get('DATA_DIR'),
+            profile=environ.get('FLASK_PROFILE') == '1',
+            profile_dir=environ.get('FLASK_PROFILE_DIR'),
+        )
+
+    @property
+    def is_prod(self):
+        """True when running with FLASK_ENV=production."""
+        return self.flask_env == 'production'
+
+
+# The parsed environment of this process.
+ENV = Env.from_environ()
@@ -12,6 +12,7 @@ The extensions are typically initialized with the Flask app instance (using thei
 in `app/__init__.py`).
 """
 from flask_jwt_extended import JWTManager
+from flask_caching import Cache
 
 # Instantiate Flask-JWT-Extended.
 # This `jwt` object will be configured and registered with the Flask app
@@ -19,6 +20,11 @@ from flask_jwt_extended import JWTManager
 # which calls `jwt.init_app(app)`).
 jwt = JWTManager()
 
+# Instantiate Flask-Caching.
+# Initialized in `create_app` with an in-process SimpleCache; used to memoize
+# expensive read helpers such as the API's ticket count (`app.api.get_total_tickets_count`).
+cache = Cache()
+
 # Example of how other extensions would be added:
 # from flask_sqlalchemy import SQLAlchemy
 # from flask_marshmallow import Marshmallow
@@ -10,7 +10,7 @@ import smtplib
 from email.mime.text import MIMEText # For creating email messages.
 import requests # For making HTTP requests (e.g., to Pushover API).
 from apprise import Apprise # Multi-platform notification library.
-from app.db import db_manager # Global database manager instance.
+from app.db import db_manager, load_settings # Global database manager instance and cached settings.
 from utils.context_runner import run_in_app_context # For running tasks in app context (background threads).
 from flask import current_app # To access Flask app's logger and config.
 
@@ -27,12 +27,10 @@ def send_email_notification(subject, body, to_email):
         to_email (str): The recipient's email address.
     """
     logger = current_app.logger
-    try:
-        # Fetch all current application settings from the database.
-        settings_rows = db_manager.fetchall("SELECT key, value FROM settings")
-        settings = {row['key']: row['value'] for row in settings_rows}
-    except Exception as e:
-        logger.error(f"Failed to load settings from database for email notification: {e}", exc_info=True)
+    # Current application settings (cached per process; see app.db.load_settings).
+    settings = load_settings()
+    if not settings:
+        logger.error("Failed to load settings from database for email notification.")
         return # Cannot proceed without SMTP settings.
 
     # Retrieve SMTP configuration from the loaded settings.
@@ -294,11 +292,9 @@ def test_smtp_connection():
                       connection error, authentication failure, timeout).
     """
     logger = current_app.logger
-    try:
-        settings_rows = db_manager.fetchall("SELECT key, value FROM settings")
-        settings = {row['key']: row['value'] for row in settings_rows}
-    except Exception as e:
-        logger.error(f"Failed to load settings from database for SMTP test: {e}", exc_info=True)
+    settings = load_settings() # Cached per process; see app.db.load_settings.
+    if not settings:
+        logger.error("Failed to load settings from database for SMTP test.")
         raise ValueError("Could not load SMTP settings from the database for testing.")
 
     smtp_server = settings.get("smtp_server")
@@ -18,7 +18,7 @@ database table). The value for each key is another dictionary containing:
                      (for boolean-like settings), 'text', 'password', 'number'.
 
 This `DEFAULT_SETTINGS` dictionary is primarily used by:
-1.  `app.db.ensure_default_settings()`: To populate the 'settings' table in the
+1.  `app.db.bootstrap_db()`: To populate the 'settings' table in the
     database with these default values if they don't already exist during
     application initialization.
 2.  The settings page template (`templates/settings.html`): To dynamically render
@@ -87,7 +87,7 @@ DEFAULT_SETTINGS = {
     },
 
     # --- Default Administrator Account Settings ---
-    # These are typically used only once during initial setup by `ensure_admin_user`.
+    # These are typically used only once during initial setup by `app.db.bootstrap_db`.
     # It's highly recommended to change the default admin password immediately after setup.
     'admin_username': {
         'default': 'admin',
@@ -1,21 +1,32 @@
 # routes/__init__.py
+#
+# The route modules are NOT imported here: importing any `routes.xxx` module runs this file
+# first, so eager imports here would load every blueprint (and its dependencies) whenever one
+# of them is needed. `register_blueprints()` imports them when the app is created.
+import importlib
 
-from routes.main import main_bp
-from routes.auth import auth_bp
-from routes.tickets import tickets_bp
-from routes.users import users_bp
-from routes.settings_routes import settings_bp
-from routes.notifications_routes import notifications_bp
-from routes.queues import queues_bp
-from routes.profile import profile_bp
+# (module path, blueprint attribute) for every blueprint, in registration order.
+# The order is fixed here on purpose: main_bp owns the least specific rules ("/" and
+# "/favicon.ico") and is registered last, after the feature blueprints.
+BLUEPRINTS = (
+    ("routes.auth", "auth_bp"),
+    ("routes.tickets", "tickets_bp"),
+    ("routes.users", "users_bp"),
+    ("routes.settings_routes", "settings_bp"),
+    ("routes.notifications_routes", "notifications_bp"),
+    ("routes.queues", "queues_bp"),
+    ("routes.profile", "profile_bp"),
+    ("routes.main", "main_bp"),
+)
 
-blueprints = [
-    main_bp,
-    auth_bp,
-    tickets_bp,
-    users_bp,
-    settings_bp,
-    notifications_bp,
-    queues_bp,
-    profile_bp
-]
+
+def register_blueprints(app):
+    """
+    Imports the route modules listed in `BLUEPRINTS` and registers their blueprints on `app`.
+
+    Returns:
+        int: The number of blueprints registered.
+    """
+    for module_path, attr_name in BLUEPRINTS:
+        app.register_blueprint(getattr(importlib.import_module(module_path), attr_name))
+    return len(BLUEPRINTS)
@@ -6,8 +6,9 @@ endpoints, managing user sessions and interactions with the database
 for user credential verification and creation.
 """
 from flask import Blueprint, request, redirect, url_for, render_template, session, flash, current_app
-from werkzeug.security import generate_password_hash, check_password_hash
-from app.db import db_manager # Use the global db_manager instance for database operations
+from utils.passwords import hash_password, verify_password # Application-wide password KDF and verification.
+from app.db import db_manager, load_settings # Global db_manager instance and cached settings.
+from utils.reference_data import invalidate_users # Keeps cached user dropdowns fresh.
 import sqlite3 # Imported specifically for catching sqlite3.IntegrityError
 
 # Define the Blueprint for authentication routes.
@@ -22,10 +23,9 @@ def is_registration_allowed():
     Returns:
         bool: True if registration is allowed, False otherwise.
     """
-    # Fetches the 'allow_registration' setting from the database.
-    setting = db_manager.fetchone("SELECT value FROM settings WHERE key = 'allow_registration'")
+    # Reads the 'allow_registration' setting from the cached settings (see app.db.load_settings).
     # Returns True if the setting exists and its value is '1'.
-    return setting and setting['value'] == '1'
+    return load_settings().get('allow_registration') == '1'
 
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
@@ -71,7 +71,7 @@ def register():
         #     return redirect(url_for('auth_bp.register'))
 
         # Securely hash the password before storing it.
-        hashed_password = generate_password_hash(raw_password)
+        hashed_password = hash_password(raw_password)
 
         try:
             # Check if the username already exists to prevent duplicates.
@@ -86,6 +86,7 @@ def register():
                 'INSERT INTO users (username, password) VALUES (?, ?)',
                 (username, hashed_password)
             )
+            invalidate_users()
             current_app.logger.info(f"New user registered: {username}")
             flash('Registration successful! You can now log in.', 'success')
             return redirect(url_for('auth_bp.login')) # Redirect to login page after successful registration.
@@ -128,12 +129,18 @@ def login():
             return render_template('login.html', registration_enabled=registration_enabled)
 
         try:
-            # Fetch the user from the database by username.
-            user = db_manager.fetchone('SELECT * FROM users WHERE username = ?', (username,))
+            # Fetch only the columns login needs (not notification keys etc.) by username.
+            # db_manager.fetchone returns after the connection is released, so the slow hash
+            # verification below never holds a database connection.
+            user = db_manager.fetchone(
+                'SELECT id, username, password, is_admin, theme FROM users WHERE username = ?',
+                (username,)
+            )
 
             # Verify user existence and password correctness.
-            # `check_password_hash` compares the provided password with the stored hash.
-            if user and check_password_hash(user['password'], password_from_form):
+            # `verify_password` (utils/passwords.py) compares the provided password with the stored hash.
+            # Unknown usernames are checked against a dummy hash so both failure cases take equally long.
+            if verify_password(user['password'] if user else None, password_from_form):
                 # Successful login: store user information in the session.
                 session['user_id'] = user['id']
                 session['username'] = user['username']
@@ -4,15 +4,91 @@ Main application routes.
 This module defines the primary routes for the application, including the
 main ticket listing page (index) and the favicon.
 """
-from flask import Blueprint, render_template, request, session, abort, redirect, url_for, send_from_directory, current_app
+from flask import Blueprint, render_template, request, session, redirect, url_for, send_from_directory, current_app, flash
 from utils.decorators import login_required # Custom decorator to ensure user is logged in.
+from utils.render_cache import page_cache_key, get_cached_page, store_cached_page # Short-lived rendered page cache.
 from datetime import datetime
+import time
 from app.db import db_manager # Use the global db_manager instance for database operations.
 import os
 
 # Define the Blueprint for main application routes.
 main_bp = Blueprint('main_bp', __name__)
 
+# --- Ticket List Queries ---
+# The index page queries are built once at import time, so every request executes one of a
+# fixed set of SQL texts and sqlite3's per-connection statement cache can reuse the prepared
+# statements. The assignee filter selects a separate SQL variant rather than being bound as
+# `(:assigned_to IS NULL OR assigned_to = :assigned_to)`: SQLite cannot use an index for
+# that OR, so it scanned the whole tickets table. The "assigned to me" variants spell the
+# closed-ticket filter out literally, which lets the open-only case use the partial index
+# idx_tickets_assignee_open_created (see init_db()); the unfiltered list binds :show_closed,
+# since it walks the whole table in ORDER BY order either way.
+def _index_where_sql(assigned_only, show_closed):
+    """WHERE clause of the index page queries for the given filters."""
+    if not assigned_only:
+        return "WHERE (:show_closed OR tickets.status != 'closed')"
+    if show_closed:
+        return "WHERE tickets.assigned_to = :assigned_to"
+    return "WHERE tickets.assigned_to = :assigned_to AND tickets.status != 'closed'"
+
+# (assigned_only, show_closed) combinations, the keys of the per-filter query variants.
+_INDEX_FILTERS = tuple((assigned_only, show_closed) for assigned_only in (False, True) for show_closed in (False, True))
+
+# Allowed 'sort_by' values and their ORDER BY clauses.
+_INDEX_SORT_COLUMNS = {
+    'created_at': 'tickets.created_at DESC', # Newest tickets first.
+    'deadline': 'tickets.deadline ASC NULLS LAST', # Approaching deadlines first, NULLs at the end.
+    'priority': 'tickets.priority_rank ASC, tickets.created_at DESC', # Sort by priority (indexed rank column), then by creation date.
+    'queue': 'queues.name ASC, tickets.created_at DESC', # Sort by queue name, then by creation date.
+    'assigned_to': "COALESCE(users.username, 'zzzzzz') ASC, tickets.created_at DESC", # Sort by assignee, unassigned last, then by creation date.
+                                                                                    # 'zzzzzz' pushes NULL usernames (unassigned) to the end.
+}
+
+# Count of the user's tickets (assigned_only), keyed by show_closed. The LEFT JOINs of the
+# page query do not change the number of rows, so they are omitted here.
+INDEX_COUNT_QUERY = {
+    show_closed: f"SELECT COUNT(*) AS total_count FROM tickets {_index_where_sql(True, show_closed)}"
+    for show_closed in (False, True)
+}
+
+# Count without an assignee filter, read from the trigger-maintained per-status totals
+# (see ticket_stats in app/db.py) instead of scanning the tickets table.
+INDEX_STATS_COUNT_QUERY = """
+    SELECT COALESCE(SUM(cnt), 0) AS total_count FROM ticket_stats
+    WHERE (:show_closed OR status != 'closed')
+"""
+
+# One page of tickets per (sort option, assigned_only, show_closed). Selects exactly the columns the list template uses.
+# Display values are computed in SQL (overdue flag, formatted creation date, "Unassigned"
+# fallback), so the sqlite3.Row objects can be handed to the template as-is without a
+# per-row Python loop. Explicit columns (instead of tickets.*) also keep the 'assigned_to'
+# alias unambiguous.
+INDEX_PAGE_QUERIES = {
+    (sort_key, assigned_only, show_closed): f"""
+        SELECT
+            tickets.id,
+            tickets.title,
+            tickets.status,
+            tickets.priority,
+            tickets.deadline,
+            tickets.created_at AS created_at_raw,
+            strftime('%Y-%m-%d %H:%M', tickets.created_at, 'unixepoch', 'localtime') AS created_at_formatted,
+            (tickets.deadline IS NOT NULL AND tickets.status != 'closed'
+             AND tickets.deadline < :now) AS is_overdue,
+            queues.name AS queue,
+            COALESCE(users.username, 'Unassigned') AS assigned_to
+        FROM tickets
+        LEFT JOIN queues ON tickets.queue_id = queues.id
+        LEFT JOIN users ON tickets.assigned_to = users.id
+        {_index_where_sql(assigned_only, show_closed)}
+        ORDER BY {order_by_clause}
+        LIMIT :lim OFFSET :off
+    """
+    for sort_key, order_by_clause in _INDEX_SORT_COLUMNS.items()
+    for assigned_only, show_closed in _INDEX_FILTERS
+}
+
 @main_bp.route('/favicon.ico')
 def favicon():
     """
@@ -27,6 +103,18 @@ def favicon():
         mimetype='image/png' # Explicitly set the MIME type.
     )
 
+@main_bp.app_template_filter('datetimeformat')
+def datetimeformat(value, fmt='%Y-%m-%d %H:%M'):
+    """
+    Jinja filter formatting a Unix epoch timestamp (as stored in the database) in local time.
+
+    Registered app-wide through the blueprint, usable in any template:
+    `{{ ticket['deadline']|datetimeformat }}`. Returns an empty string for NULL values.
+    """
+    if value is None or value == '':
+        return ''
+    return datetime.fromtimestamp(int(value)).strftime(fmt)
+
 @main_bp.route("/")
 # @login_required # Uncomment this if the index page should always require login.
                   # Current logic redirects if not logged in, but decorator is cleaner.
@@ -39,7 +127,8 @@ def index():
     - Filters tickets based on 'assigned_only' and 'show_closed' query parameters.
     - Sorts tickets based on 'sort_by' query parameter.
     - Paginates results.
-    - Processes ticket data for display (e.g., deadline overdue check, date formatting).
+    - Computes display values in SQL (e.g., deadline overdue check, date formatting).
+    - Serves recently rendered HTML from a short-lived cache (see utils/render_cache.py).
     """
     current_app.logger.info(
         "Index page accessed.",
@@ -55,143 +144,77 @@ def index():
         flash("Please log in to view this page.", "info") # Optional: provide a message.
         return redirect(url_for('auth_bp.login')) # Use url_for for robust routing.
 
+    # --- Rendered page cache ---
+    # The page embeds per-session state (theme, admin menu, CSRF token), so all of it is
+    # part of the key. Pending flash messages are rendered (and consumed) by base.html,
+    # so such requests neither read nor populate the cache. Without a CSRF token in the
+    # session yet, the render would create one, so the result is not stored either.
+    csrf_session_token = session.get('csrf_token')
+    use_cache = '_flashes' not in session
+    cache_key = page_cache_key(
+        session['user_id'], session.get('theme'), session.get('is_admin'), csrf_session_token,
+        frozenset(request.args.items(multi=True))
+    )
+    if use_cache:
+        cached_html = get_cached_page(cache_key)
+        if cached_html is not None:
+            return cached_html
+
     # --- Get and process request arguments for filtering, sorting, and pagination ---
     assigned_only = request.args.get('assigned_only', 'false').lower() == 'true'
     show_closed = request.args.get('show_closed', 'false').lower() == 'true'
     sort_by = request.args.get('sort_by', 'created_at') # Default sort: newest first.
-    page = request.args.get('page', 1, type=int) # Default to page 1.
+    page = max(request.args.get('page', 1, type=int), 1) # Default to page 1; never below it.
     per_page = 15 # Number of tickets to display per page.
 
-    # --- Define allowed sort options and their corresponding SQL ORDER BY clauses ---
-    # This dictionary maps user-friendly sort keys to SQL expressions.
-    sort_columns = {
-        'created_at': 'tickets.created_at DESC', # Newest tickets first.
-        'deadline': 'tickets.deadline ASC NULLS LAST', # Approaching deadlines first, NULLs at the end.
-        'priority': '''CASE LOWER(tickets.priority)
-                        WHEN 'high' THEN 1
-                        WHEN 'medium' THEN 2
-                        WHEN 'low' THEN 3
-                        ELSE 4
-                      END, tickets.created_at DESC''', # Sort by priority, then by creation date.
-        'queue': 'queues.name ASC, tickets.created_at DESC', # Sort by queue name, then by creation date.
-        'assigned_to': 'COALESCE(users.username, "zzzzzz") ASC, tickets.created_at DESC' # Sort by assignee, unassigned last, then by creation date.
-                                                                                    # "zzzzzz" pushes NULL usernames (unassigned) to the end.
-    }
-
     # Validate the 'sort_by' parameter; default if invalid.
-    if sort_by not in sort_columns:
+    if sort_by not in _INDEX_SORT_COLUMNS:
         sort_by = 'created_at' # Fallback to default sort option.
-    order_by_clause = sort_columns[sort_by]
 
-    # --- Construct SQL query components ---
-    # Base FROM and JOIN clauses for fetching ticket data.
-    base_query_joins = '''
-        FROM tickets
-        LEFT JOIN queues ON tickets.queue_id = queues.id
-        LEFT JOIN users ON tickets.assigned_to = users.id
-    '''
-
-    # WHERE clauses for filtering.
-    where_clauses = [] # List to hold individual WHERE conditions.
-    params = []        # List to hold parameters for the SQL query (prevents SQL injection).
-
-    if not show_closed:
-        where_clauses.append('LOWER(tickets.status) != ?')
-        params.append('closed')
-
-    if assigned_only:
-        user_id = session.get('user_id')
-        # This check is redundant if @login_required is used, but good for clarity here.
-        if not user_id:
-            current_app.logger.warning("Attempt to filter by 'assigned_only' without a logged-in user.")
-            abort(401) # Unauthorized access.
-        where_clauses.append('tickets.assigned_to = ?')
-        params.append(user_id)
-
-    # Combine WHERE clauses if any exist.
-    where_clause_sql = ''
-    if where_clauses:
-        where_clause_sql = 'WHERE ' + ' AND '.join(where_clauses)
+    # Named parameters shared by the count and page queries. A variant that does not use
+    # one of them (e.g., :assigned_to without assigned_only) simply ignores it.
+    query_params = {
+        'show_closed': int(show_closed),
+        # With 'assigned_only', session['user_id'] is guaranteed by the login check above.
+        'assigned_to': session['user_id'] if assigned_only else None,
+    }
 
     # --- Pagination: Calculate total number of tickets matching filters ---
-    count_query = f'SELECT COUNT(tickets.id) AS total_count {base_query_joins} {where_clause_sql}'
-    current_app.logger.debug(f"Executing count query: {count_query} with params: {tuple(params)}")
-    total_row = db_manager.fetchone(count_query, tuple(params)) # Ensure params is a tuple.
+    logger = current_app.logger
+    logger.debug("Executing count query with params: %s", query_params)
+    count_query = INDEX_COUNT_QUERY[show_closed] if assigned_only else INDEX_STATS_COUNT_QUERY
+    total_row = db_manager.fetchone(count_query, query_params)
     total_tickets = total_row['total_count'] if total_row else 0
-    current_app.logger.debug(f"Total tickets matching criteria: {total_tickets}")
+    logger.debug("Total tickets matching criteria: %s", total_tickets)
 
     total_pages = (total_tickets + per_page - 1) // per_page # Calculate total pages.
     offset = (page - 1) * per_page # Calculate offset for the current page.
 
     # --- Main ticket data query ---
-    # Selects all necessary ticket fields and related data (queue name, assignee username).
-    main_data_query = f'''
-        SELECT
-            tickets.*,
-            queues.name AS queue_name,
-            users.username AS assigned_to_username
-        {base_query_joins}
-        {where_clause_sql}
-        ORDER BY {order_by_clause}
-        LIMIT ? OFFSET ?
-    '''
-    current_app.logger.debug(f"Executing main data query: {main_data_query} with params: {(*params, per_page, offset)}")
-    
-    # Fetch ticket rows from the database.
-    ticket_rows = db_manager.fetchall(main_data_query, (*params, per_page, offset))
-
-    # --- Process fetched ticket data for display ---
-    processed_tickets = []
-    for row in ticket_rows:
-        deadline_str = row['deadline']
-        is_overdue = False
-        if deadline_str:
-            try:
-                # Attempt to parse deadline from ISO format first.
-                deadline_dt = datetime.fromisoformat(deadline_str)
-            except ValueError:
-                try:
-                    # Fallback to common datetime format if ISO parsing fails.
-                    deadline_dt = datetime.strptime(deadline_str, '%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    deadline_dt = None # Unable to parse deadline.
-                    current_app.logger.warning(f"Could not parse deadline string: '{deadline_str}' for ticket ID {row['id']}")
-            
-            if deadline_dt and row['status'].lower() != 'closed': # Only check overdue if not closed
-                is_overdue = datetime.now() > deadline_dt
-
-        # Format 'created_at' for display.
-        try:
-            created_at_dt = datetime.fromisoformat(row['created_at'])
-            created_at_formatted = created_at_dt.strftime('%Y-%m-%d %H:%M') # More readable format.
-        except Exception as e:
-            created_at_formatted = "Unknown" # Fallback if parsing fails.
-            current_app.logger.warning(f"Could not parse created_at string: '{row['created_at']}' for ticket ID {row['id']}: {e}")
-
-        processed_tickets.append({
-            'id': row['id'],
-            'title': row['title'],
-            'description': row['description'], # Consider truncating for list view if too long.
-            'status': row['status'],
-            'priority': row['priority'],
-            'deadline': deadline_str, # Original deadline string.
-            'created_at_raw': row['created_at'], # Raw created_at for potential further use.
-            'created_at_formatted': created_at_formatted, # Formatted for display.
-            'is_overdue': is_overdue,
-            'queue': row['queue_name'],
-            'assigned_to': row['assigned_to_username'] or "Unassigned" # Display "Unassigned" if no assignee.
-        })
-    current_app.logger.debug(f"Processed {len(processed_tickets)} tickets for display on page {page}.")
+    query_params.update({
+        'now': int(time.time()), # Reference time for the overdue check (integer compare in SQLite).
+        'lim': per_page,
+        'off': offset,
+    })
+    logger.debug("Executing main data query (sort_by=%s) with params: %s", sort_by, query_params)
+
+    # Fetch ticket rows from the database; the template reads them directly.
+    tickets = db_manager.fetchall(INDEX_PAGE_QUERIES[sort_by, assigned_only, show_closed], query_params)
+    logger.debug("Fetched %s tickets for display on page %s.", len(tickets), page)
 
     # --- Render the template with processed data and view options ---
-    return render_template(
+    html = render_template(
         'index.html',
-        tickets=processed_tickets,
+        tickets=tickets,
         show_closed=show_closed,
         assigned_only=assigned_only,
         sort_by=sort_by,
+        page=page, # Used by the pagination links in index.html.
         current_page=page, # Renamed 'page' to 'current_page' for clarity in template.
         total_pages=total_pages,
         per_page=per_page,
         total_tickets=total_tickets
     )
+    if use_cache and csrf_session_token is not None:
+        store_cached_page(cache_key, html)
+    return html
@@ -6,7 +6,7 @@ allowing logged-in users to view and update their personal information,
 notification preferences, password, and UI theme.
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, abort, current_app
-from werkzeug.security import generate_password_hash # For hashing new passwords.
+from utils.passwords import hash_password # For hashing new passwords.
 from app.db import db_manager # Global database manager instance.
 from utils.decorators import login_required # Ensures only logged-in users can access.
 from app.notifications_core import send_email_notification, send_pushover_notification, send_apprise_notification # Core notification functions.
@@ -106,7 +106,7 @@ def profile():
 
             # If a new password was provided, hash and update it.
             if new_password:
-                hashed_password = generate_password_hash(new_password)
+                hashed_password = hash_password(new_password)
                 db_manager.execute_query('UPDATE users SET password = ? WHERE id = ?', (hashed_password, user_id))
                 current_app.logger.info(f"User ID {user_id} updated their password.", extra=log_update_details)
             
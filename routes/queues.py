@@ -9,6 +9,7 @@ from flask import Blueprint, render_template, request, session, current_app, fla
 from utils.decorators import login_required, admin_required # Ensure only logged-in admins can access.
 from utils.session_helpers import get_current_session_info # Helper for session data.
 from app.db import db_manager # Global database manager instance.
+from utils.reference_data import invalidate_queues # Keeps cached queue dropdowns fresh.
 import sqlite3 # Imported specifically for catching sqlite3.IntegrityError.
 
 # Define the Blueprint for queue management routes.
@@ -48,6 +49,7 @@ def manage_queues():
                 # Attempt to insert the new queue into the database.
                 # The 'name' column in the 'queues' table has a UNIQUE constraint.
                 new_queue_id = db_manager.insert("INSERT INTO queues (name) VALUES (?)", (queue_name.strip(),))
+                invalidate_queues()
                 log_extra_create['created_queue_id'] = new_queue_id # Add new ID to logs.
                 current_app.logger.info(f"New queue '{queue_name.strip()}' (ID: {new_queue_id}) created successfully.", extra=log_extra_create)
                 flash(f"Queue '{queue_name.strip()}' created successfully.", "success")
@@ -7,7 +7,7 @@ options, API enablement, and SMTP configuration for email notifications.
 """
 from flask import Blueprint, render_template, request, session, flash, jsonify, current_app, redirect, url_for
 from utils.decorators import login_required, admin_required # Ensure only logged-in admins can access.
-from app.db import db_manager # Global database manager instance.
+from app.db import db_manager, load_settings, invalidate_settings # Database manager and cached settings.
 import smtplib # For testing SMTP connections.
 import re # For regular expression matching, e.g., email validation.
 
@@ -20,14 +20,11 @@ def get_all_settings():
 
     Returns:
         dict: A dictionary where keys are setting names and values are their
-              corresponding values from the 'settings' table.
+              corresponding values from the 'settings' table (see `app.db.load_settings`).
     """
-    try:
-        rows = db_manager.fetchall("SELECT key, value FROM settings")
-        return {row['key']: row['value'] for row in rows}
-    except Exception as e:
-        current_app.logger.error(f"Failed to fetch all settings from database: {e}", exc_info=True)
-        return {} # Return empty dict on error to prevent crashes.
+    # Cached per process and invalidated below whenever settings are saved. On a database
+    # error load_settings() logs it and returns an empty dict.
+    return load_settings()
 
 @settings_bp.route('/settings', methods=['GET', 'POST'])
 @login_required # User must be logged in.
@@ -97,14 +94,15 @@ def system_settings():
             # If not filled, the existing 'smtp_password' in the DB remains unchanged.
 
             try:
-                for key, value in settings_to_update.items():
-                    # Update each setting in the database.
-                    # Assumes 'key' is PRIMARY KEY in 'settings' table.
-                    # Using an UPSERT-like logic: update if exists, or insert if not (though settings should exist from defaults).
-                    # A more robust way might be to check existence first or use specific UPSERT SQL.
-                    # For simplicity, assuming all keys exist and we are just updating values.
-                    db_manager.execute_query("UPDATE settings SET value = ? WHERE key = ?", (value, key))
-                
+                # All settings are updated in one transaction (one commit). Assumes 'key' is the
+                # PRIMARY KEY of 'settings' and that every key exists (the defaults are inserted at
+                # startup by bootstrap_db), so a plain UPDATE per key is enough.
+                db_manager.update_many(
+                    "UPDATE settings SET value = ? WHERE key = ?",
+                    [(value, key) for key, value in settings_to_update.items()]
+                )
+                invalidate_settings() # Drop this process's cached settings so the change is visible at once.
+
                 # Create a loggable version of settings (omitting actual password).
                 loggable_settings_summary = {k: v for k, v in settings_to_update.items() if k != 'smtp_password'}
                 loggable_settings_summary['smtp_password_changed'] = 'yes' if smtp_password_form else 'no'
@@ -19,7 +19,10 @@ from app.db import db_manager # Global database manager instance.
 from app.notifications_core import notify_assigned_user # Core notification logic.
 from utils.files import allowed_file # Helper to check for allowed file extensions.
 from utils.context_runner import run_in_app_context # Runs a function within app context (for notifications).
+from utils.render_cache import mark_tickets_changed # Invalidates cached ticket list pages.
+from utils.reference_data import get_queues, get_users # Cached queue/user lists for dropdowns.
 import os
+import time
 import sqlite3 # For specific IntegrityError if needed, though db_manager might abstract.
 
 # Define the Blueprint for ticket routes.
@@ -49,8 +52,8 @@ def ticket_detail(ticket_id):
         ORDER BY created_at ASC
     ''', (ticket_id,))
 
-    # Fetch all users for populating dropdowns (e.g., assign user).
-    users = db_manager.fetchall('SELECT id, username FROM users ORDER BY username ASC')
+    # All users for populating dropdowns (e.g., assign user); served from the in-process cache.
+    users = get_users()
     # Fetch attachments for this ticket.
     raw_attachments = db_manager.fetchall('SELECT * FROM attachments WHERE ticket_id = ? ORDER BY uploaded_at DESC', (ticket_id,))
 
@@ -100,6 +103,7 @@ def update_assigned_to(ticket_id):
 
     # Update the ticket's 'assigned_to' field in the database.
     db_manager.execute_query('UPDATE tickets SET assigned_to = ? WHERE id = ?', (validated_assigned_user_id, ticket_id))
+    mark_tickets_changed()
     
     # If a user was assigned (not unassigned), trigger a notification.
     if validated_assigned_user_id:
@@ -130,10 +134,11 @@ def create_ticket():
     if request.method == 'GET':
         current_app.logger.info("User accessed the create new ticket page.", extra=log_extra_base)
 
-    # Fetch data needed for the form (queues, users for assignment).
+    # Data needed for the form (queues, users for assignment). These change rarely and are
+    # served from an in-process cache, so the common GET path runs no queries at all.
     try:
-        queues = db_manager.fetchall("SELECT id, name FROM queues ORDER BY name ASC")
-        users = db_manager.fetchall("SELECT id, username FROM users ORDER BY username ASC")
+        queues = get_queues()
+        users = get_users()
     except Exception as e:
         current_app.logger.error(f"Error fetching queues/users for create ticket page: {e}", extra=log_extra_base, exc_info=True)
         flash("Error loading page data. Please try again or contact support.", "danger")
@@ -148,7 +153,7 @@ def create_ticket():
         queue_id_str = request.form.get('queue_id')
         assigned_to_user_id_str = request.form.get('assigned_to') or None # Can be empty if not assigned.
         
-        created_at_iso = datetime.now().isoformat() # Timestamp for creation.
+        created_at_epoch = int(time.time()) # Creation timestamp (Unix epoch seconds).
         initial_status = 'open' # Default status for new tickets.
 
         log_extra_create = {
@@ -163,11 +168,11 @@ def create_ticket():
         if not description: errors['description'] = "Description is a required field."
         if priority not in ['low', 'medium', 'high']: errors['priority'] = "Invalid priority selected."
 
-        validated_deadline_iso = None
+        validated_deadline_epoch = None
         if deadline_str: # If a deadline was provided.
             try:
-                # Parse and reformat to ensure consistent ISO format.
-                validated_deadline_iso = datetime.fromisoformat(deadline_str).isoformat()
+                # The form sends local wall-clock time; store it as Unix epoch seconds.
+                validated_deadline_epoch = int(datetime.fromisoformat(deadline_str).timestamp())
             except ValueError:
                 errors['deadline'] = "Invalid deadline format. Please use YYYY-MM-DDTHH:MM."
         
@@ -220,10 +225,11 @@ def create_ticket():
             new_ticket_id = db_manager.insert('''
                 INSERT INTO tickets (title, description, status, priority, deadline, created_at, queue_id, assigned_to, created_by)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                (title, description, initial_status, priority, validated_deadline_iso, created_at_iso, 
+                (title, description, initial_status, priority, validated_deadline_epoch, created_at_epoch, 
                  queue_id_to_save, assigned_to_user_id_to_save, current_user_id)
             )
             log_extra_create['created_ticket_id'] = new_ticket_id # Add new ticket ID to logs.
+            mark_tickets_changed()
 
             # Handle file attachment if one was provided.
             file_attachment = request.files.get('file') # Get file from the form.
@@ -281,7 +287,7 @@ def add_comment(ticket_id):
     current_user_id = session_info['user_id'] # User adding the comment.
 
     content = request.form.get('content') # Comment text from the form.
-    created_at_iso = datetime.now().isoformat() # Timestamp for the comment.
+    created_at_epoch = int(time.time()) # Timestamp for the comment (Unix epoch seconds).
 
     if not content or not content.strip(): # Ensure comment is not empty or just whitespace.
         current_app.logger.warning("Add comment attempt failed: Content was empty.", extra=log_extra)
@@ -289,7 +295,8 @@ def add_comment(ticket_id):
     else:
         # Insert the new comment into the database.
         db_manager.insert('INSERT INTO comments (ticket_id, content, user_id, created_at) VALUES (?, ?, ?, ?)',
-                          (ticket_id, content.strip(), current_user_id, created_at_iso))
+                          (ticket_id, content.strip(), current_user_id, created_at_epoch))
+        mark_tickets_changed() # Comment counts/activity on cached ticket pages are now stale.
         current_app.logger.info(f"Comment added to ticket ID {ticket_id} by user ID {current_user_id}. Queuing notification.", extra=log_extra)
         # Notify relevant users about the new comment.
         run_in_app_context(current_app._get_current_object(), notify_assigned_user, ticket_id, 'new_comment', current_user_id)
@@ -322,6 +329,7 @@ def update_status(ticket_id):
     else:
         # Update the ticket status in the database.
         db_manager.execute_query('UPDATE tickets SET status = ? WHERE id = ?', (new_status.lower(), ticket_id))
+        mark_tickets_changed()
         current_app.logger.info(f"Ticket ID {ticket_id} status updated to '{new_status}' by user ID {current_user_id}. Queuing notification.", extra=log_extra)
         # Notify relevant users about the status change.
         run_in_app_context(current_app._get_current_object(), notify_assigned_user, ticket_id, 'status_update', current_user_id)
@@ -353,6 +361,7 @@ def update_priority(ticket_id):
     else:
         # Update the ticket priority in the database.
         db_manager.execute_query('UPDATE tickets SET priority = ? WHERE id = ?', (new_priority.lower(), ticket_id))
+        mark_tickets_changed()
         current_app.logger.info(f"Ticket ID {ticket_id} priority updated to '{new_priority}' by user ID {current_user_id}. Queuing notification.", extra=log_extra)
         # Notify relevant users about the priority change.
         run_in_app_context(current_app._get_current_object(), notify_assigned_user, ticket_id, 'priority_update', current_user_id)
@@ -6,11 +6,14 @@ related to managing application users, including listing, adding,
 editing, and deleting users.
 """
 from flask import Blueprint, request, redirect, url_for, session, render_template, flash, abort, current_app
-from werkzeug.security import generate_password_hash # For hashing new passwords.
+from utils.passwords import hash_password # For hashing new passwords.
 from utils.decorators import login_required, admin_required # Ensure only logged-in admins can access.
 from utils.session_helpers import get_current_session_info # Helper for session data.
 from utils.db_utils import get_user_or_404 # Helper to fetch a user or raise 404.
 from app.db import db_manager # Global database manager instance.
+from app.database_manager import get_database_connection # For multi-statement transactions.
+from utils.reference_data import invalidate_users # Keeps cached user dropdowns fresh.
+from utils.render_cache import mark_tickets_changed # Invalidates cached ticket list pages.
 import sqlite3 # For catching sqlite3.IntegrityError specifically.
 import re # For regular expression matching, e.g., email validation.
 
@@ -71,11 +74,12 @@ def manage_users():
                 current_app.logger.warning(f"Admin user creation form validation errors: {errors_add_user}", extra=log_add_extra)
             else:
                 try:
-                    password_hash = generate_password_hash(raw_password) # Securely hash the password.
+                    password_hash = hash_password(raw_password) # Securely hash the password.
                     db_manager.insert(
                         "INSERT INTO users (username, password, is_admin) VALUES (?, ?, ?)",
                         (new_username, password_hash, is_admin_flag_for_new_user)
                     )
+                    invalidate_users()
                     current_app.logger.info(f"Admin successfully created new user: '{new_username}'.", extra=log_add_extra)
                     flash(f"User '{new_username}' created successfully.", "success")
                 except sqlite3.IntegrityError: # Username likely already exists.
@@ -93,27 +97,43 @@ def manage_users():
             log_delete_extra = {**log_base_extra, 'attempted_delete_username': username_to_delete}
             current_app.logger.info(f"Admin attempting to delete user: '{username_to_delete}'.", extra=log_delete_extra)
 
-            user_record_to_delete = db_manager.fetchone("SELECT id, is_admin FROM users WHERE username = ?", (username_to_delete,))
-
-            if not user_record_to_delete:
-                flash(f"User '{username_to_delete}' not found.", "warning")
-                current_app.logger.warning(f"Admin delete user: User '{username_to_delete}' not found.", extra=log_delete_extra)
-            elif user_record_to_delete["is_admin"] == 1: # Check if the user to be deleted is an admin.
-                flash("Cannot delete an administrator user. Demote them first if necessary.", "danger")
-                current_app.logger.warning(f"Admin delete user: Attempt to delete admin user '{username_to_delete}'.", extra=log_delete_extra)
-            elif user_record_to_delete["id"] == current_admin_user_id: # Prevent self-deletion.
-                flash("You cannot delete your own account.", "danger")
-                current_app.logger.warning("Admin delete user: Attempt to self-delete.", extra=log_delete_extra)
-            else:
-                try:
-                    # TODO: Consider what happens to tickets/comments created by or assigned to this user.
-                    #       Database schema uses ON DELETE SET NULL for foreign keys, which is a good default.
-                    db_manager.delete("DELETE FROM users WHERE username = ?", (username_to_delete,))
-                    current_app.logger.info(f"Admin successfully deleted user: '{username_to_delete}'.", extra=log_delete_extra)
-                    flash(f"User '{username_to_delete}' deleted successfully.", "success")
-                except Exception as e:
-                    current_app.logger.error(f"Admin delete user failed for '{username_to_delete}' due to an unexpected error: {e}", extra=log_delete_extra, exc_info=True)
-                    flash("An unexpected error occurred while deleting the user.", "danger")
+            deleted_user = False
+            delete_executed = False
+            try:
+                # The lookup, the checks and the DELETE share one connection and one transaction,
+                # committed once when the `with` block exits (rolled back on any exception).
+                # sqlite3 would only BEGIN implicitly before the DELETE, leaving the SELECT and
+                # the checks outside the transaction, so it is opened explicitly (and takes the
+                # write lock) first: nobody can promote the user in between.
+                with get_database_connection() as conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    user_record_to_delete = conn.execute("SELECT id, is_admin FROM users WHERE username = ?", (username_to_delete,)).fetchone()
+
+                    if not user_record_to_delete:
+                        flash(f"User '{username_to_delete}' not found.", "warning")
+                        current_app.logger.warning(f"Admin delete user: User '{username_to_delete}' not found.", extra=log_delete_extra)
+                    elif user_record_to_delete["is_admin"] == 1: # Check if the user to be deleted is an admin.
+                        flash("Cannot delete an administrator user. Demote them first if necessary.", "danger")
+                        current_app.logger.warning(f"Admin delete user: Attempt to delete admin user '{username_to_delete}'.", extra=log_delete_extra)
+                    elif user_record_to_delete["id"] == current_admin_user_id: # Prevent self-deletion.
+                        flash("You cannot delete your own account.", "danger")
+                        current_app.logger.warning("Admin delete user: Attempt to self-delete.", extra=log_delete_extra)
+                    else:
+                        # TODO: Consider what happens to tickets/comments created by or assigned to this user.
+                        #       Database schema uses ON DELETE SET NULL for foreign keys, which is a good default.
+                        conn.execute("DELETE FROM users WHERE id = ?", (user_record_to_delete["id"],))
+                        delete_executed = True
+                # Reached only once the `with` block has committed.
+                deleted_user = delete_executed
+            except Exception as e:
+                current_app.logger.error(f"Admin delete user failed for '{username_to_delete}' due to an unexpected error: {e}", extra=log_delete_extra, exc_info=True)
+                flash("An unexpected error occurred while deleting the user.", "danger")
+            if deleted_user: # Only after the transaction has committed.
+                invalidate_users()
+                # ON DELETE SET NULL cleared assigned_to on the user's tickets, so cached lists are stale.
+                mark_tickets_changed()
+                current_app.logger.info(f"Admin successfully deleted user: '{username_to_delete}'.", extra=log_delete_extra)
+                flash(f"User '{username_to_delete}' deleted successfully.", "success")
             return redirect(url_for('users_bp.manage_users'))
 
     # For GET requests, or if POST didn't explicitly redirect (should not happen with current logic).
@@ -190,19 +210,24 @@ def edit_user(user_id_to_edit):
             return render_template('edit_user.html', user=user_to_edit, errors=edit_errors)
 
         try:
-            # Update user's general information.
-            db_manager.execute_query(
-                '''UPDATE users SET email = ?, pushover_user_key = ?, pushover_api_token = ?,
-                   notify_email = ?, notify_pushover = ?, apprise_url = ?, notify_apprise = ?, is_admin = ?
-                   WHERE id = ?''',
-                (email, pushover_user_key, pushover_api_token, notify_email, notify_pushover,
-                 apprise_url, notify_apprise, is_admin_form, user_id_to_edit)
-            )
-
-            # If a new password was provided, hash and update it.
-            if new_password:
-                hashed_password = generate_password_hash(new_password)
-                db_manager.execute_query('UPDATE users SET password = ? WHERE id = ?', (hashed_password, user_id_to_edit))
+            # Hash before opening the connection so the (slow) KDF does not hold it.
+            hashed_password = hash_password(new_password) if new_password else None
+
+            # Both UPDATEs run in a single transaction (one commit).
+            with get_database_connection() as conn:
+                # Update user's general information.
+                conn.execute(
+                    '''UPDATE users SET email = ?, pushover_user_key = ?, pushover_api_token = ?,
+                       notify_email = ?, notify_pushover = ?, apprise_url = ?, notify_apprise = ?, is_admin = ?
+                       WHERE id = ?''',
+                    (email, pushover_user_key, pushover_api_token, notify_email, notify_pushover,
+                     apprise_url, notify_apprise, is_admin_form, user_id_to_edit)
+                )
+
+                # If a new password was provided, store its hash.
+                if hashed_password:
+                    conn.execute('UPDATE users SET password = ? WHERE id = ?', (hashed_password, user_id_to_edit))
+            if hashed_password:
                 current_app.logger.info(f"Admin updated password for user ID {user_id_to_edit}.", extra=log_base_extra)
 
             current_app.logger.info(f"Admin successfully updated details for user ID {user_id_to_edit} ('{user_to_edit['username']}').", extra=log_base_extra)
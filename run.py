@@ -9,14 +9,11 @@ For production deployments, a WSGI server like Gunicorn or uWSGI would
 typically be used, and they would import the `app` object (or call `create_app`)
 directly, rather than executing this script.
 """
-# Import the application factory function from the 'app' package (app/__init__.py).
-from app.app import app # Direct import of app instance from app.app
+# Import the application factory from the 'app' package (app/__init__.py), the single
+# factory used by every entry point, and build the app instance.
+from app import create_app
 
-# Note: The original template had `from app import create_app` and `app = create_app()`.
-# If app.app directly provides the configured app instance, then `create_app()` call is not needed here.
-# If app.app.py is structured to be the one calling create_app and defining 'app',
-# then importing 'app' from there is correct.
-# The key is that 'app' here should be the fully configured Flask app instance.
+app = create_app() # The fully configured Flask app instance (also usable as a WSGI entry point).
 
 # The `if __name__ == '__main__':` block ensures that the Flask development
 # server is started only when this script is executed directly
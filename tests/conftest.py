@@ -0,0 +1,33 @@
+"""
+Shared fixtures: applications built by the package factory in a temporary data directory.
+"""
+import pytest
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """
+    Returns a function that creates an app through `app.create_app()` with DATA_DIR set to
+    `tmp_path`, so the database is `tmp_path/instance/database.db`. A database file placed
+    there before the call is used as-is (e.g., a legacy schema to be migrated).
+    """
+    import app as app_package
+    from app.env import Env
+
+    monkeypatch.setattr(app_package, "ENV", Env.from_environ({"DATA_DIR": str(tmp_path)}))
+    created = []
+
+    def _make_app():
+        application = app_package.create_app()
+        created.append(application)
+        return application
+
+    yield _make_app
+    for application in created:
+        application.extensions['log_listener'].stop()
+
+
+@pytest.fixture
+def app(make_app):
+    """An app created by the package factory on a new, empty database."""
+    return make_app()
@@ -0,0 +1,19 @@
+"""
+Tests for the configuration applied by the application factory.
+"""
+import pytest
+
+pytest.importorskip("flask")
+
+
+def test_session_cookie_flags_come_from_config(app):
+    from app.config import Config
+
+    assert app.config['SESSION_COOKIE_SECURE'] is Config.SESSION_COOKIE_SECURE
+    assert app.config['SESSION_COOKIE_HTTPONLY'] is True
+    assert app.config['SESSION_COOKIE_SAMESITE'] == 'Lax'
+
+
+def test_factory_overrides_paths_after_config(app, tmp_path):
+    assert app.config['UPLOAD_FOLDER'] == str(tmp_path / "uploads")
+    assert app.config['DATABASE'] == str(tmp_path / "instance" / "database.db")
@@ -0,0 +1,18 @@
+"""
+Tests for parsing the process environment (app/env.py).
+"""
+import pytest
+
+pytest.importorskip("flask") # app.env is imported through the app package, which needs Flask.
+
+from app.env import Env
+
+
+@pytest.mark.parametrize("environ, expected", [
+    ({}, False), # Plain-HTTP default (e.g., docker-compose without a proxy).
+    ({'FLASK_ENV': 'production'}, True),
+    ({'FLASK_ENV': 'production', 'SESSION_COOKIE_SECURE': 'False'}, False),
+    ({'SESSION_COOKIE_SECURE': 'TRUE'}, True),
+])
+def test_session_cookie_secure_default_follows_flask_env(environ, expected):
+    assert Env.from_environ(environ).session_cookie_secure is expected
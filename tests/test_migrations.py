@@ -0,0 +1,143 @@
+"""
+Tests for init_db() upgrading databases created by older versions of the schema.
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("flask")
+
+# The schema as created by the first release: ISO-8601 text timestamps, no priority_rank,
+# no updated_at, no ticket_stats.
+LEGACY_SCHEMA = """
+CREATE TABLE queues (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE);
+CREATE TABLE tickets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT NOT NULL DEFAULT 'open' CHECK(status IN ('open', 'in progress', 'closed')),
+    priority TEXT NOT NULL DEFAULT 'medium' CHECK(priority IN ('low', 'medium', 'high')),
+    deadline TEXT,
+    created_at TEXT NOT NULL,
+    created_by INTEGER,
+    queue_id INTEGER NOT NULL,
+    assigned_to INTEGER,
+    FOREIGN KEY (queue_id) REFERENCES queues(id) ON DELETE CASCADE,
+    FOREIGN KEY (assigned_to) REFERENCES users(id) ON DELETE SET NULL,
+    FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
+);
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    email TEXT,
+    apprise_url TEXT,
+    pushover_user_key TEXT,
+    pushover_api_token TEXT,
+    is_admin INTEGER DEFAULT 0,
+    notify_email INTEGER DEFAULT 0,
+    notify_pushover INTEGER DEFAULT 0,
+    notify_apprise INTEGER DEFAULT 0,
+    theme TEXT DEFAULT 'dark'
+);
+CREATE TABLE comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_id INTEGER NOT NULL,
+    user_id INTEGER,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (ticket_id) REFERENCES tickets(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+);
+CREATE TABLE attachments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_id INTEGER NOT NULL,
+    user_id INTEGER,
+    original_filename TEXT NOT NULL,
+    stored_filename TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    uploaded_at TEXT NOT NULL,
+    FOREIGN KEY (ticket_id) REFERENCES tickets(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+);
+CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# (title, status, priority, deadline, created_at) as written by datetime.now().isoformat().
+LEGACY_TICKETS = [
+    ('first', 'open', 'high', '2024-01-02T09:00:00', '2024-01-01T12:00:00'),
+    ('second', 'closed', 'low', None, '2024-01-01T13:00:00.123456'),
+    ('third', 'open', 'medium', None, '2024-01-01T14:00:00'),
+]
+LEGACY_COMMENT_CREATED_AT = '2024-01-01T12:30:00'
+
+
+def _epoch(iso_text):
+    """The epoch seconds the migration is expected to produce (naive local time, whole seconds)."""
+    return int(datetime.fromisoformat(iso_text).replace(microsecond=0).timestamp())
+
+
+@pytest.fixture
+def legacy_app(make_app, tmp_path):
+    """An app created on top of a database with the legacy schema and some data."""
+    (tmp_path / "instance").mkdir()
+    conn = sqlite3.connect(tmp_path / "instance" / "database.db")
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO queues (name) VALUES ('Support')")
+    conn.execute("INSERT INTO users (username, password) VALUES ('alice', 'x')")
+    conn.executemany(
+        "INSERT INTO tickets (title, status, priority, deadline, created_at, queue_id, assigned_to) "
+        "VALUES (?, ?, ?, ?, ?, 1, 1)",
+        LEGACY_TICKETS,
+    )
+    conn.execute("INSERT INTO comments (ticket_id, user_id, content, created_at) VALUES (1, 1, 'hi', ?)",
+                 (LEGACY_COMMENT_CREATED_AT,))
+    conn.execute("INSERT INTO attachments (ticket_id, user_id, original_filename, stored_filename, filepath, uploaded_at) "
+                 "VALUES (1, 1, 'f.txt', 'f.txt', '/tmp/f.txt', '2024-01-01T12:31:00')")
+    conn.commit()
+    conn.close()
+    return make_app()
+
+
+@pytest.fixture
+def migrated_db(legacy_app):
+    conn = sqlite3.connect(legacy_app.config['DATABASE'])
+    yield conn
+    conn.close()
+
+
+def test_ticket_timestamps_become_epoch_integers(migrated_db):
+    rows = migrated_db.execute(
+        "SELECT created_at, typeof(created_at), deadline FROM tickets ORDER BY id"
+    ).fetchall()
+    assert [(created_at, kind) for created_at, kind, _ in rows] == [
+        (_epoch(created_at), 'integer') for *_, created_at in LEGACY_TICKETS
+    ]
+    assert [deadline for *_, deadline in rows] == [
+        _epoch(deadline) if deadline else None for _, _, _, deadline, _ in LEGACY_TICKETS
+    ]
+    assert migrated_db.execute("SELECT type FROM pragma_table_info('tickets') WHERE name = 'created_at'").fetchone() == ('INTEGER',)
+
+
+def test_comment_timestamps_become_epoch_integers(migrated_db):
+    assert migrated_db.execute("SELECT created_at, typeof(created_at) FROM comments").fetchall() == [
+        (_epoch(LEGACY_COMMENT_CREATED_AT), 'integer')
+    ]
+
+
+def test_rebuild_keeps_foreign_keys_and_children(migrated_db):
+    assert migrated_db.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert migrated_db.execute("SELECT COUNT(*) FROM comments").fetchone() == (1,)
+    assert migrated_db.execute("SELECT COUNT(*) FROM attachments").fetchone() == (1,)
+
+
+def test_ticket_stats_and_priority_rank_are_seeded(migrated_db):
+    assert dict(migrated_db.execute("SELECT status, cnt FROM ticket_stats")) == {'open': 2, 'closed': 1}
+    assert migrated_db.execute("SELECT priority_rank FROM tickets ORDER BY id").fetchall() == [(1,), (3,), (2,)]
+
+
+def test_triggers_and_indexes_are_recreated(migrated_db):
+    names = {name for (name,) in migrated_db.execute("SELECT name FROM sqlite_master WHERE type IN ('trigger', 'index')")}
+    assert {'trg_tickets_priority_rank_insert', 'trg_tickets_updated_at',
+            'idx_tickets_created_id', 'idx_comments_ticket_id'} <= names
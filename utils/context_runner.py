@@ -5,7 +5,16 @@ This is essential for background tasks or operations initiated from a request
 that need to access Flask's application context (e.g., `current_app`,
 database connections, configuration, logger) but should not block the main
 request-response cycle.
+
+Two variants are provided:
+- `run_in_app_context()` starts a new thread per call.
+- `enqueue_in_app_context()` hands the call to a single long-lived worker thread,
+  which drains queued calls in batches and runs each batch inside one application
+  context. Use it on paths that may fire many background calls in bursts (e.g., the
+  ticket webhook), where per-call thread creation and context setup add up.
 """
+import logging
+import queue
 import threading
 from flask import current_app # Though not directly used in run_in_app_context, it's related.
 
@@ -79,4 +88,65 @@ def run_in_app_context(app, target_func, *args, **kwargs):
     # `daemon=True` means the thread will not prevent the main application from exiting.
     thread = threading.Thread(target=wrapped_target, daemon=True)
     thread.start() # Start the execution of the thread.
-    # The function returns immediately after starting the thread; it does not wait for completion.
\ No newline at end of file
+    # The function returns immediately after starting the thread; it does not wait for completion.
+
+
+# --- Shared Background Worker ---
+# Maximum number of queued calls run under one application context push.
+TASK_BATCH_MAX = 32
+
+# (app, target_func, args, kwargs) tuples waiting for the worker thread.
+_task_queue = queue.SimpleQueue()
+# The worker is started lazily (so it is created in each server worker process after fork).
+_task_worker = None
+_task_worker_lock = threading.Lock()
+
+
+def _run_queued_tasks():
+    """Worker thread loop: waits for a call, then runs it together with any others already queued."""
+    while True:
+        batch = [_task_queue.get()] # Block until there is work.
+        while len(batch) < TASK_BATCH_MAX:
+            try:
+                batch.append(_task_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Normally there is one app per process; group anyway so each call runs under its own app.
+        by_app = {}
+        for app, target_func, args, kwargs in batch:
+            by_app.setdefault(app, []).append((target_func, args, kwargs))
+
+        for app, calls in by_app.items():
+            with app.app_context():
+                for target_func, args, kwargs in calls:
+                    try:
+                        target_func(*args, **kwargs)
+                    except Exception as e:
+                        # Log and continue, so one failing call does not drop the rest of the batch.
+                        app.logger.error(
+                            f"Exception in queued background task '{target_func.__name__}': {e}",
+                            exc_info=True # Includes stack trace.
+                        )
+
+
+def enqueue_in_app_context(app, target_func, *args, **kwargs):
+    """
+    Queues `target_func(*args, **kwargs)` to run on the shared background worker thread,
+    inside an application context of `app`. Returns immediately.
+
+    Args:
+        app (Flask): The actual Flask application instance
+                     (e.g., `current_app._get_current_object()`).
+        target_func (callable): The function to be executed in the background.
+        *args: Positional arguments to pass to `target_func`.
+        **kwargs: Keyword arguments to pass to `target_func`.
+    """
+    global _task_worker
+    if _task_worker is None or not _task_worker.is_alive():
+        with _task_worker_lock:
+            if _task_worker is None or not _task_worker.is_alive():
+                # `daemon=True` means the thread will not prevent the application from exiting.
+                _task_worker = threading.Thread(target=_run_queued_tasks, name="app-context-tasks", daemon=True)
+                _task_worker.start()
+    _task_queue.put((app, target_func, args, kwargs))
@@ -5,12 +5,9 @@ This module provides helper functions and constants related to file operations,
 such as validating file extensions for uploads.
 """
 
-# A set of allowed file extensions for uploads.
-# Using a set provides efficient membership testing (e.g., `ext in ALLOWED_EXTENSIONS`).
-# Extensions are stored in lowercase to ensure case-insensitive comparison.
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'docx', 'xlsx', 'pptx', 'txt', 'log', 'csv', 'zip', 'rar'}
-# Added 'gif', 'xlsx', 'pptx', 'log', 'csv', 'zip', 'rar' for broader common use cases.
-# Consider making this configurable via application settings if more flexibility is needed.
+# The allowed extensions (a lowercase frozenset) and the length of the longest one are defined
+# once in app/config.py and re-exported here for existing imports.
+from app.config import ALLOWED_EXTENSIONS, MAX_EXT_LEN
 
 def allowed_file(filename):
     """
@@ -32,10 +29,8 @@ def allowed_file(filename):
         allowed_file("script.py")     # False (if 'py' is not in ALLOWED_EXTENSIONS)
         allowed_file("nodotfilename") # False
     """
-    # 1. Check if a '.' character exists in the filename, indicating an extension part.
-    # 2. If it exists, split the filename at the last '.' to get the extension.
-    #    `rsplit('.', 1)` splits from the right, at most once. `[1]` gets the part after the dot.
-    # 3. Convert the extracted extension to lowercase for case-insensitive comparison.
-    # 4. Check if this lowercase extension is present in the `ALLOWED_EXTENSIONS` set.
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # 1. Split the filename at the last '.'; `rpartition` returns an empty separator if there is none.
+    # 2. Reject suffixes longer than the longest allowed extension without lowercasing or hashing them.
+    # 3. Check the lowercased extension against the `ALLOWED_EXTENSIONS` frozenset.
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and len(extension) <= MAX_EXT_LEN and extension.lower() in ALLOWED_EXTENSIONS
@@ -0,0 +1,110 @@
+"""
+Password hashing helpers.
+
+All password hashes in the application are created through `hash_password()`
+so the key derivation function is chosen in one place instead of relying on
+Werkzeug's default (which has changed between Werkzeug releases).
+
+Choice of method:
+    scrypt with N=2**15, r=8, p=1 (`"scrypt:32768:8:1"`, the parameters of
+    Werkzeug 3.1's default, pinned here). Werkzeug delegates to `hashlib.scrypt`,
+    which runs in OpenSSL. It is memory-hard (about 32 MiB per hash) and costs
+    less than half the CPU time of PBKDF2-SHA256 at the OWASP-recommended 600,000
+    iterations, so registration, admin user creation and password changes block a
+    request thread for a shorter time.
+
+Existing hashes created with another method (e.g., PBKDF2) remain valid:
+`check_password_hash` reads the method from the stored hash.
+
+Verification:
+    `verify_password()` wraps Werkzeug's `check_password_hash` (the stored
+    hash's KDF via hashlib/OpenSSL, plus `hmac.compare_digest`) and remembers successful verifications for
+    `VERIFY_CACHE_TTL_SECONDS`, so clients that log in repeatedly (e.g., API
+    clients polling /api/token) skip the KDF. Neither passwords nor hashes are
+    kept in the cache: entries are keyed by an HMAC of (stored hash, password)
+    under a random per-process key. Failed verifications are never cached, and a
+    password change produces a new stored hash and therefore a new key.
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Method string passed to werkzeug.security.generate_password_hash.
+PASSWORD_HASH_METHOD = "scrypt:32768:8:1"
+
+# How long a successful verification is remembered, in seconds.
+VERIFY_CACHE_TTL_SECONDS = 60
+# Maximum number of remembered verifications per process.
+VERIFY_CACHE_MAX_ENTRIES = 1024
+
+# Random key for the cache keys; never leaves the process.
+_verify_cache_key = os.urandom(32)
+# HMAC digest -> expiry (time.monotonic()). OrderedDict gives oldest-first eviction.
+_verified = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+def hash_password(raw_password):
+    """
+    Hashes a plaintext password with the application's configured KDF.
+
+    Args:
+        raw_password (str): The plaintext password.
+
+    Returns:
+        str: The hash string to store in the `users.password` column.
+    """
+    return generate_password_hash(raw_password, method=PASSWORD_HASH_METHOD)
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash():
+    """A hash of a random password, created on first use (not at import, the KDF is slow)."""
+    return hash_password(os.urandom(16).hex())
+
+
+def verify_password(stored_hash, raw_password):
+    """
+    Checks a plaintext password against a stored hash.
+
+    Pass `stored_hash=None` when the user does not exist: the password is then
+    checked against a dummy hash with the same KDF, so a login attempt for an
+    unknown username takes as long as one with a wrong password and response
+    times do not reveal which usernames exist.
+
+    Args:
+        stored_hash (str or None): The value of the `users.password` column, or None.
+        raw_password (str): The plaintext password to check.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    if stored_hash is None:
+        check_password_hash(_dummy_password_hash(), raw_password)
+        return False
+
+    cache_key = hmac.new(
+        _verify_cache_key, f"{stored_hash}\0{raw_password}".encode(), hashlib.sha256
+    ).digest()
+    now = time.monotonic()
+    with _verified_lock:
+        expires = _verified.get(cache_key)
+        if expires is not None:
+            if expires > now:
+                return True
+            del _verified[cache_key]
+
+    if not check_password_hash(stored_hash, raw_password):
+        return False
+
+    with _verified_lock:
+        _verified[cache_key] = now + VERIFY_CACHE_TTL_SECONDS
+        _verified.move_to_end(cache_key)
+        while len(_verified) > VERIFY_CACHE_MAX_ENTRIES:
+            _verified.popitem(last=False) # Drop the oldest entry.
+    return True
@@ -0,0 +1,62 @@
+"""
+Cached reference data used to populate form dropdowns.
+
+The list of queues and the list of users (id and username only) change rarely
+but are needed on every render of the ticket creation form and the ticket
+detail page. They are memoized in-process here.
+
+Invalidation:
+- Routes that add or remove queues/users call `invalidate_queues()` /
+  `invalidate_users()` right after their write.
+- Each cache entry is additionally tied to a time bucket of
+  `REFERENCE_DATA_TTL_SECONDS`, so when the app runs with several worker
+  processes (which cannot invalidate each other's caches) a change made
+  through another worker becomes visible after at most that long.
+"""
+import time
+from functools import lru_cache
+from app.db import db_manager # Global database manager instance.
+
+# Maximum age of cached reference data, in seconds.
+REFERENCE_DATA_TTL_SECONDS = 30
+
+
+def _ttl_bucket():
+    """Returns the current time bucket; a new bucket forces a reload."""
+    return int(time.monotonic() // REFERENCE_DATA_TTL_SECONDS)
+
+
+@lru_cache(maxsize=1)
+def _queues_cached(_bucket):
+    # The rows are returned as a tuple so callers cannot mutate the shared cached value.
+    return tuple(db_manager.fetchall("SELECT id, name FROM queues ORDER BY name ASC"))
+
+
+@lru_cache(maxsize=1)
+def _users_cached(_bucket):
+    # Only id and username: password hashes and notification keys are never cached.
+    return tuple(db_manager.fetchall("SELECT id, username FROM users ORDER BY username ASC"))
+
+
+def get_queues():
+    """
+    Returns all queues as `sqlite3.Row` objects with 'id' and 'name', ordered by name.
+    """
+    return _queues_cached(_ttl_bucket())
+
+
+def get_users():
+    """
+    Returns all users as `sqlite3.Row` objects with 'id' and 'username', ordered by username.
+    """
+    return _users_cached(_ttl_bucket())
+
+
+def invalidate_queues():
+    """Drops the cached queue list. Call after creating, renaming or deleting a queue."""
+    _queues_cached.cache_clear()
+
+
+def invalidate_users():
+    """Drops the cached user list. Call after creating, renaming or deleting a user."""
+    _users_cached.cache_clear()
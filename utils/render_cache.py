@@ -0,0 +1,81 @@
+"""
+Short-lived in-process cache for rendered pages.
+
+The ticket list (index page) is the most frequently requested page in the
+application, and within a few seconds it renders identical HTML for the same
+user and query string. This module keeps a small LRU of rendered HTML strings
+so that repeated hits (e.g., a dashboard being refreshed) skip both the
+database queries and the Jinja render.
+
+Entries are invalidated in two ways:
+- Any ticket mutation calls `mark_tickets_changed()`, which bumps a marker that
+  is part of every cache key, so stale entries are simply never looked up again.
+- The key also contains a coarse time bucket (`CACHE_TTL_SECONDS`), so entries
+  expire on their own. This bounds staleness when the app runs with several
+  worker processes (e.g., gunicorn -w 4), where a mutation handled by one
+  worker cannot invalidate another worker's cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Lifetime of a cached page, in seconds (granularity of the time bucket).
+CACHE_TTL_SECONDS = 5
+# Maximum number of rendered pages kept per process.
+CACHE_MAX_ENTRIES = 256
+
+# Marker of the last ticket write handled by this process. Part of every key.
+_last_ticket_mutation = time.monotonic()
+# Rendered HTML keyed by the tuple built in `page_cache_key()`. OrderedDict gives LRU order.
+_pages = OrderedDict()
+# Request handlers may run in several threads (e.g., threaded dev server).
+_lock = threading.Lock()
+
+
+def mark_tickets_changed():
+    """
+    Records that ticket data has changed so cached pages are no longer served.
+
+    Call this after any INSERT/UPDATE/DELETE that affects what the ticket
+    list shows (tickets themselves, their status, priority, assignment, or
+    comments).
+    """
+    global _last_ticket_mutation
+    _last_ticket_mutation = time.monotonic()
+
+
+def page_cache_key(*parts):
+    """
+    Builds a cache key from the caller-supplied parts plus the invalidation markers.
+
+    Args:
+        *parts: Hashable values identifying the page variant (user, query arguments,
+                and any per-session state rendered into the page).
+
+    Returns:
+        tuple: The cache key.
+    """
+    return (*parts, _last_ticket_mutation, int(time.monotonic() // CACHE_TTL_SECONDS))
+
+
+def get_cached_page(key):
+    """
+    Returns the cached HTML for `key`, or None on a miss.
+    """
+    with _lock:
+        html = _pages.get(key)
+        if html is not None:
+            _pages.move_to_end(key) # Mark as most recently used.
+        return html
+
+
+def store_cached_page(key, html):
+    """
+    Stores rendered HTML under `key`, evicting the least recently used entries
+    when the cache is full.
+    """
+    with _lock:
+        _pages[key] = html
+        _pages.move_to_end(key)
+        while len(_pages) > CACHE_MAX_ENTRIES:
+            _pages.popitem(last=False) # Drop the oldest entry.
@@ -0,0 +1,51 @@
+"""
+Startup compilation of Jinja templates.
+
+By default Jinja compiles a template the first time it is rendered, in every
+worker process, so the first request to each page pays for parsing and code
+generation. `precompile_templates()` compiles every template while the app is
+being created instead:
+
+- The environment's template cache is made unbounded (`cache_size=-1`); the
+  application has only a handful of templates, and Jinja's default LRU of 400
+  entries would otherwise be the limit.
+- A `FileSystemBytecodeCache` stores the compiled code on disk, so the other
+  gunicorn workers (and later restarts) load it instead of compiling again.
+  Without arguments it uses a per-user directory in the system temp folder
+  that is created with owner-only permissions.
+"""
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+
+
+def configure_template_cache(app):
+    """
+    Sets the Jinja options for `precompile_templates()`.
+
+    Must be called before `app.jinja_env` is first accessed: Flask creates the
+    environment from `app.jinja_options` once and caches it.
+    """
+    app.jinja_options = {
+        **app.jinja_options,
+        'cache_size': -1, # Never evict compiled templates.
+        'bytecode_cache': FileSystemBytecodeCache(),
+    }
+
+
+def precompile_templates(app):
+    """
+    Loads (and thereby compiles and caches) every template the app can find.
+
+    A template with a syntax error is logged and skipped, so the error surfaces
+    when the page is requested, as it would without precompilation.
+
+    Returns:
+        int: The number of templates compiled.
+    """
+    compiled = 0
+    for name in app.jinja_env.list_templates():
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except TemplateSyntaxError as e:
+            app.logger.error("Template %s failed to compile: %s", name, e)
+    return compiled
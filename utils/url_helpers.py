@@ -0,0 +1,55 @@
+"""
+Memoized `url_for` for templates.
+
+Templates call `url_for` once per link, and every call runs Werkzeug's URL
+builder (rule lookup, converter calls, quoting). The links in this application
+are built from a small set of (endpoint, arguments) combinations, so
+`cached_url_for()` remembers the results and is installed as the `url_for`
+Jinja global by the application factories.
+
+The result of `url_for` also depends on the request: the application root
+(`request.script_root`, e.g. when mounted under a prefix by a reverse proxy)
+and, for `_external=True`, the host. Both are part of the cache key, so the
+cache is shared safely across requests. The URL map only changes while the
+app is being set up (blueprint registration), before the first request, so no
+invalidation hook is needed.
+
+Calls the cache cannot handle fall through to `flask.url_for` unchanged:
+blueprint-relative endpoints (".name", which depend on the current blueprint),
+unhashable argument values, and calls made outside a request.
+"""
+from functools import lru_cache
+from flask import has_request_context, request, url_for
+
+# Maximum number of distinct URLs remembered per process.
+URL_CACHE_MAX_ENTRIES = 4096
+
+
+@lru_cache(maxsize=URL_CACHE_MAX_ENTRIES)
+def _cached_url_for(script_root, host, endpoint, values_key):
+    # script_root/host are only part of the key; url_for reads them from the current request.
+    # values_key holds (name, type, value) triples: equal values of different types (1, 1.0,
+    # True) hash alike but can build different URLs, so the type is part of the key.
+    # (`lru_cache(typed=True)` would not help, since it only looks at the top-level arguments.)
+    return url_for(endpoint, **{name: value for name, _, value in values_key})
+
+
+def cached_url_for(endpoint, **values):
+    """
+    Drop-in replacement for `flask.url_for` that memoizes the generated URLs.
+
+    Args:
+        endpoint (str): The endpoint name, e.g. 'main_bp.index'.
+        **values: URL rule arguments and query-string parameters, as for `url_for`.
+
+    Returns:
+        str: The generated URL.
+    """
+    if endpoint.startswith('.') or not has_request_context():
+        return url_for(endpoint, **values)
+    host = request.host_url if values.get('_external') else None
+    try:
+        values_key = tuple((name, type(value), value) for name, value in sorted(values.items()))
+        return _cached_url_for(request.script_root, host, endpoint, values_key)
+    except TypeError: # Unhashable argument value (e.g., a list).
+        return url_for(endpoint, **values)